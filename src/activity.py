@@ -0,0 +1,135 @@
+"""
+Bitmap index of user activity: one bit per (user, license) and day.
+
+Building it is a single pass over the rows; afterwards days active, first/last seen,
+retention and weekly cohorts are popcounts and bitwise ORs over the bitmap, so their
+cost depends on the number of users and days, not on how many requests users made.
+"""
+import numpy as np
+import pandas as pd
+
+from src.memo import per_frame
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class ActivityIndex:
+    def __init__(self, keys, days, bits):
+        """
+
+        :param keys: DataFrame with uuid and license, one row per bitmap row
+        :param days: sorted DatetimeIndex, one entry per bit column
+        :param bits: uint8 array of packed day bits, shape (len(keys), ceil(len(days) / 8))
+        """
+        self.keys = keys
+        self.days = days
+        self.bits = bits
+
+    @classmethod
+    def from_frame(cls, df):
+        uuid_codes, uuids = pd.factorize(df["uuid"])
+        license_codes, licenses = pd.factorize(df["license"])
+        key_codes, pairs = pd.factorize(uuid_codes.astype(np.int64) * len(licenses) + license_codes)
+
+        # Parse each distinct day once instead of every row.
+        day_codes, day_values = pd.factorize(df["day_id"])
+        dates = pd.to_datetime(day_values)
+        order = np.argsort(dates.values)
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(len(order))
+
+        active = np.zeros((len(pairs), len(dates)), dtype=bool)
+        active[key_codes, position[day_codes]] = True
+
+        keys = pd.DataFrame({
+            "uuid": np.asarray(uuids)[pairs // len(licenses)],
+            "license": np.asarray(licenses)[pairs % len(licenses)],
+        })
+        return cls(keys, pd.DatetimeIndex(dates[order]), np.packbits(active, axis=1))
+
+    def _active(self, bits=None):
+        bits = self.bits if bits is None else bits
+        return np.unpackbits(bits, axis=1, count=len(self.days)).astype(bool)
+
+    def user_bits(self):
+        """
+        Merges the rows of users seen with several licenses with a bitwise OR.
+
+        :return: (uuids, packed bits per uuid)
+        """
+        codes, uuids = pd.factorize(self.keys["uuid"])
+        merged = np.zeros((len(uuids), self.bits.shape[1]), dtype=np.uint8)
+        np.bitwise_or.at(merged, codes, self.bits)
+        return np.asarray(uuids), merged
+
+    def days_active(self, by_license=True):
+        """
+
+        :param by_license: count per (uuid, license) like groupby(["uuid", "license"]), else per uuid
+        :return: DataFrame with uuid, license (if by_license) and days_active
+        """
+        if by_license:
+            return self.keys.assign(days_active=_POPCOUNT[self.bits].sum(axis=1, dtype=np.int64))
+        uuids, bits = self.user_bits()
+        return pd.DataFrame({"uuid": uuids, "days_active": _POPCOUNT[bits].sum(axis=1, dtype=np.int64)})
+
+    def first_last_seen(self):
+        """
+
+        :return: DataFrame with uuid, first_seen and last_seen
+        """
+        uuids, bits = self.user_bits()
+        active = self._active(bits)
+        first = active.argmax(axis=1)
+        last = len(self.days) - 1 - active[:, ::-1].argmax(axis=1)
+        return pd.DataFrame({"uuid": uuids, "first_seen": self.days[first], "last_seen": self.days[last]})
+
+    def retention(self, n):
+        """
+
+        :param n: number of days
+        :return: share of users active on more than n days, in percent
+        """
+        return (self.days_active(by_license=False)["days_active"] > n).mean() * 100
+
+    def weekly(self):
+        """
+
+        :return: (uuids, week start dates, bool array uuids x weeks of weeks with any activity)
+        """
+        uuids, bits = self.user_bits()
+        active = self._active(bits)
+        week = self.days.to_period("W").start_time
+        starts = np.flatnonzero(np.r_[True, week[1:] != week[:-1]])
+        return uuids, pd.DatetimeIndex(week[starts]), np.logical_or.reduceat(active, starts, axis=1)
+
+    def cohort_matrix(self):
+        """
+        Users grouped by the week they were first active in.
+
+        :return: DataFrame indexed by cohort week with the share (percent) of the cohort
+            active in each following week, columns are weeks since the first one
+        """
+        _, weeks, active = self.weekly()
+        first = active.argmax(axis=1)
+        matrix = np.full((len(weeks), len(weeks)), np.nan)
+        sizes = np.bincount(first, minlength=len(weeks))
+        for cohort in np.flatnonzero(sizes):
+            members = active[first == cohort, cohort:]
+            matrix[cohort, :members.shape[1]] = members.mean(axis=0) * 100
+        return pd.DataFrame(
+            matrix[sizes > 0],
+            index=pd.Index(weeks[sizes > 0].strftime("%Y-%m-%d"), name="cohort"),
+            columns=pd.Index(range(len(weeks)), name="week"),
+        )
+
+
+@per_frame
+def activity_index(df):
+    """
+    ActivityIndex for df, shared by every chart of a rerun.
+
+    :param df: dataset
+    :return: ActivityIndex
+    """
+    return ActivityIndex.from_frame(df)
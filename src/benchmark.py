@@ -0,0 +1,157 @@
+"""
+Times and memory-profiles every chart builder on synthetic datasets of growing size.
+
+    python -m src.benchmark --rows 10000 100000 1000000 --json bench.json
+    python -m src.benchmark --dataset big.csv --categories
+
+--dataset benchmarks CSVs written by src.synthetic (or the real export) instead of
+in-memory data. --categories loads the string columns as pandas categoricals, which
+is what makes 100M-row datasets fit in memory.
+
+Each builder is run the way the dashboard runs it, wrapped in payload.slimmed, and its
+time and peak memory are reported. The data-prep step (groupbys, pivots, KPIs) is also
+measured on its own by running the builder with Plotly replaced by a no-op; the rest is
+reported as figure time. Builders that hand the raw rows to Plotly Express, which then
+does the grouping itself (box plots, histograms, scatters), have no separate prep step
+and are marked with "px": all their time is in the figure column.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from unittest import mock
+
+from src import charts, memo, payload
+from src.synthetic import generate
+
+STRING_COLUMNS = ["uuid", "day_id", "model", "feature", "license"]
+
+
+class _NoPlotly:
+    """
+    Accepts any Plotly Express call or figure update and does nothing, remembering
+    whether a call was handed a frame with as many rows as the dataset.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.raw = False
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        import pandas as pd
+        self.raw |= any(isinstance(a, pd.DataFrame) and len(a) == self.rows for a in (*args, *kwargs.values()))
+        return self
+
+
+def _best_time(func, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        # Indexes memoised per frame would otherwise only be built in the first run.
+        memo.clear_all()
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_mb(func, df):
+    memo.clear_all()
+    tracemalloc.start()
+    try:
+        func(df)
+        return tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+
+
+def load(path, categories=False):
+    """
+
+    :param path: CSV with the dashboard schema
+    :param categories: read the string columns as categoricals
+    :return: DataFrame
+    """
+    import pandas as pd
+    return pd.read_csv(path, dtype={c: "category" for c in STRING_COLUMNS} if categories else None)
+
+
+def bench(df, builders=None, repeat=3, figures=True):
+    """
+
+    :param df: dataset to run the builders on
+    :param builders: functions from src.charts, defaults to all of them
+    :param repeat: runs per measurement, the fastest one is kept
+    :param figures: also time the full builder including figure construction
+    :return: one result dict per builder
+    """
+    results = []
+    for build in builders or charts.CHARTS:
+        row = {"function": build.__name__, "rows": len(df)}
+        try:
+            no_plotly = _NoPlotly(len(df))
+            with mock.patch.object(charts, "px", no_plotly):
+                prep_s = _best_time(build, df, repeat)
+                prep_peak_mb = _peak_mb(build, df)
+            row["prep_in_px"] = no_plotly.raw
+            row["prep_s"] = None if no_plotly.raw else prep_s
+            row["prep_peak_mb"] = None if no_plotly.raw else prep_peak_mb
+            if figures:
+                dashboard = payload.slimmed(build)
+                row["total_s"] = _best_time(dashboard, df, repeat)
+                row["peak_mb"] = _peak_mb(dashboard, df)
+                row["figure_s"] = max(0.0, row["total_s"] - (row["prep_s"] or 0.0))
+        except Exception as e:
+            row["error"] = repr(e)
+        results.append(row)
+    return results
+
+
+def _cell(value, fmt):
+    return f"{'-':>10}" if value is None else f"{value:>10{fmt}}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chart builders on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dataset", nargs="+", help="CSVs to benchmark instead of generated data")
+    parser.add_argument("--categories", action="store_true", help="use categorical dtypes for string columns")
+    parser.add_argument("--only", nargs="+", help="builder names to run, e.g. plot13 summary_kpis")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-figures", action="store_true", help="only measure the data-prep step")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    builders = [f for f in charts.CHARTS if not args.only or f.__name__ in args.only]
+    results = []
+    sources = args.dataset or args.rows
+    for source in sources:
+        if args.dataset:
+            df = load(source, args.categories)
+        else:
+            df = generate(source)
+            if args.categories:
+                df = df.astype({c: "category" for c in STRING_COLUMNS})
+        label = f"{source}: " if args.dataset else ""
+        print(f"\n{label}{len(df):,} rows, {df.memory_usage(deep=True).sum() / 1024 ** 2:,.0f} MB in memory")
+        print(f"{'function':<14}{'prep s':>10}{'prep MB':>10}{'figure s':>10}{'total s':>10}{'peak MB':>10}")
+        for row in bench(df, builders, args.repeat, figures=not args.no_figures):
+            results.append(row)
+            if "error" in row:
+                print(f"{row['function']:<14}  {row['error']}")
+                continue
+            prep = f"{'px':>10}{'px':>10}" if row["prep_in_px"] else _cell(row["prep_s"], ".3f") + _cell(row["prep_peak_mb"], ".1f")
+            print(
+                f"{row['function']:<14}{prep}{_cell(row.get('figure_s'), '.3f')}"
+                f"{_cell(row.get('total_s'), '.3f')}{_cell(row.get('peak_mb'), '.1f')}"
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
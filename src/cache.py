@@ -0,0 +1,203 @@
+import threading
+import time
+from functools import wraps
+
+import streamlit as st
+
+from src.profiling import span
+
+MEMORY_BUDGET_MB = 256
+
+DEFAULT_POLICY = {"max_entries": 4, "ttl": 60 * 60}
+
+# Figures are slimmed before caching, so every chart entry is small and uses the
+# default policy; small KPI results get their own limits. The raw dataset and its
+# sample are held by reference (st.cache_resource): every rerun shares one frame
+# instead of unpickling a copy, and they do not count against MEMORY_BUDGET_MB.
+POLICIES = {
+    "load_data": {"max_entries": 2, "ttl": None, "resource": True},
+    "sample_data": {"max_entries": 2, "ttl": None, "resource": True},
+    "summary_kpis": {"max_entries": 8, "ttl": 2 * 60 * 60},
+    "table1": {"max_entries": 8, "ttl": 2 * 60 * 60},
+    "scenarios": {"max_entries": 16, "ttl": 2 * 60 * 60},
+}
+
+_lock = threading.Lock()
+_local = threading.local()
+_registry = {}
+_stats = {}
+# Entries stored by cache_data functions, with the arguments needed to clear them.
+_entries = []
+
+
+def _arg_key(args, kwargs):
+    # Cached frames are shared objects, so identity finds the entry a hit came from.
+    return tuple(id(a) for a in args) + tuple((k, id(v)) for k, v in sorted(kwargs.items()))
+
+
+def cached(func):
+    """
+    Wraps func in st.cache_data (or st.cache_resource) using the policy configured
+    for its name.
+
+    :param func: dashboard function to cache
+    :return: cached function counting hits and misses
+    """
+    name = func.__name__
+    policy = {**DEFAULT_POLICY, "resource": False, **POLICIES.get(name, {})}
+
+    @wraps(func)
+    def compute(*args, **kwargs):
+        _local.missed = True
+        return func(*args, **kwargs)
+
+    cache = st.cache_resource if policy["resource"] else st.cache_data
+    cached_func = cache(max_entries=policy["max_entries"], ttl=policy["ttl"])(compute)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.missed = False
+        with span(name, "cache") as record:
+            result = cached_func(*args, **kwargs)
+            record["cache"] = "miss" if _local.missed else "hit"
+        now = time.time()
+        with _lock:
+            stats = _stats[name]
+            stats["misses" if _local.missed else "hits"] += 1
+            stats["last_used"] = now
+        if policy["resource"]:
+            return result
+        entry = _track(name, args, kwargs, now, _local.missed)
+        if _local.missed:
+            _enforce_budget(protect=entry)
+        return result
+
+    wrapper.clear = cached_func.clear
+    with _lock:
+        _registry[name] = {
+            "func": wrapper, "cached": cached_func,
+            "cache_name": f"{func.__module__}.{func.__qualname__}", **policy,
+        }
+        _stats[name] = {"hits": 0, "misses": 0, "evictions": 0, "last_used": 0.0}
+    return wrapper
+
+
+def _track(name, args, kwargs, now, missed):
+    key = _arg_key(args, kwargs)
+    policy = _registry[name]
+    with _lock:
+        # Forget entries Streamlit has already dropped through ttl.
+        _entries[:] = [e for e in _entries if now - e["stored"] < e["ttl"]]
+        entry = next((e for e in _entries if e["name"] == name and e["key"] == key), None)
+        if entry is None and missed:
+            # ... or through max_entries, oldest first.
+            own = [e for e in _entries if e["name"] == name]
+            for stale in own[:max(0, len(own) + 1 - policy["max_entries"])]:
+                _entries.remove(stale)
+            entry = {
+                "name": name, "key": key, "args": args, "kwargs": kwargs,
+                "ttl": policy["ttl"] or float("inf"),
+            }
+            _entries.append(entry)
+        if entry is not None:
+            entry["last_used"] = now
+            if missed:
+                entry["stored"] = now
+        return entry
+
+
+def _entry_sizes():
+    try:
+        from streamlit.runtime.caching.cache_data_api import _data_caches
+    except ImportError:
+        return {}
+
+    # Streamlit only reports per-entry sizes per function cache; the global stats are
+    # summed per function. Older versions keep one dict of caches and return a flat
+    # list of stats, newer ones nest caches per session and group stats by family.
+    caches = list(getattr(_data_caches, "_function_caches", {}).values())
+    if caches and isinstance(caches[0], dict):
+        caches = [cache for session_caches in caches for cache in session_caches.values()]
+
+    sizes = {}
+    for cache in caches:
+        stats = cache.get_stats()
+        if isinstance(stats, dict):
+            stats = [stat for family in stats.values() for stat in family]
+        for stat in stats:
+            sizes.setdefault(stat.cache_name, []).append(stat.byte_length)
+    return sizes
+
+
+def _enforce_budget(protect=None):
+    """
+    Evicts single entries, least recently used first, until the cached data fits in
+    MEMORY_BUDGET_MB. The entry that was just stored is never evicted.
+
+    :param protect: entry to keep
+    """
+    budget = MEMORY_BUDGET_MB * 1024 ** 2
+    total = sum(sum(entries) for entries in _entry_sizes().values())
+    if total <= budget:
+        return
+
+    with _lock:
+        candidates = sorted((e for e in _entries if e is not protect), key=lambda e: e["last_used"])
+    for entry in candidates:
+        _registry[entry["name"]]["cached"].clear(*entry["args"], **entry["kwargs"])
+        with _lock:
+            if entry in _entries:
+                _entries.remove(entry)
+            _stats[entry["name"]]["evictions"] += 1
+        total = sum(sum(entries) for entries in _entry_sizes().values())
+        if total <= budget:
+            break
+
+
+def live_entries():
+    """
+
+    :return: number of entries currently held per cached function
+    """
+    sizes = _entry_sizes()
+    with _lock:
+        return {name: len(sizes.get(entry["cache_name"], [])) for name, entry in _registry.items()}
+
+
+def cache_info():
+    """
+
+    :return: one row per cached function with its policy, counters and current size
+    """
+    import pandas as pd
+
+    sizes = _entry_sizes()
+    rows = []
+    with _lock:
+        for name, entry in _registry.items():
+            stats = _stats[name]
+            live = sizes.get(entry["cache_name"], [])
+            # Every miss stores an entry, so whatever is no longer live was
+            # dropped by max_entries, ttl or the memory budget.
+            evicted = max(stats["misses"] - len(live), stats["evictions"])
+            rows.append({
+                "function": name,
+                "max_entries": entry["max_entries"],
+                "ttl_s": entry["ttl"],
+                "hits": stats["hits"],
+                "misses": stats["misses"],
+                # Resources are held by reference; Streamlit does not size them.
+                "evictions": None if entry["resource"] else evicted,
+                "entries": None if entry["resource"] else len(live),
+                "size_mb": None if entry["resource"] else sum(live) / 1024 ** 2,
+            })
+    return pd.DataFrame(rows)
+
+
+def clear_all():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    with _lock:
+        _entries.clear()
+        for stats in _stats.values():
+            stats.update(hits=0, misses=0, evictions=0)
@@ -0,0 +1,742 @@
+import plotly.express as px
+import pandas as pd
+
+from src.activity import activity_index
+from src.sampling import WEIGHT, corr_ci, is_sample, mean_ci, total_ci
+from src.scenarios import cost_simulator
+
+
+def _dates(column):
+    # Parse each distinct day once; also turns categorical day columns into real dates.
+    codes, days = pd.factorize(column)
+    return pd.Series(pd.to_datetime(days)[codes], index=column.index, name=column.name)
+
+
+def table1(df):
+    total_users = df["uuid"].nunique()
+    avg_requests = df["requests_cnt"].mean()
+    total_spent = df["spent_amount"].sum()
+    avg_spent = df["spent_amount"].mean()
+    enterprise_pct = (df["license"].eq("Enterprise").mean()) * 100
+    avg_days_active = activity_index(df).days_active(by_license=False)["days_active"].mean()
+    metrics = [
+        ("Total Users", f"{total_users:,}"),
+        ("Avg Requests", f"{avg_requests:.1f}"),
+        ("Total Spent", f"{total_spent:,.2f}"),
+        ("Avg Spent ", f"{avg_spent:.2f}"),
+        ("Enterprise %", f"{enterprise_pct:.1f}%"),
+        ("Days Active", f"{avg_days_active:,}"),
+    ]
+
+    pivot = df.pivot_table(
+        index="feature",
+        columns="model",
+        values="requests_cnt",
+        aggfunc="mean").round(1)
+
+    return {"metrics": metrics, "pivot": pivot}
+
+def plot1(df):
+    fig = px.box(
+        df,
+        x="model",
+        y="requests_cnt",
+        color="license",
+        title="Requests count per model and license",
+        color_discrete_sequence=px.colors.sequential.BuPu
+)
+
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Model",
+        yaxis_title="Requests count"
+    )
+    fig.update_yaxes(range=[0, 170])
+
+    return fig
+def plot2(df):
+    fig = px.box(
+        df,
+        x="model",
+        y="spent_amount",
+        color="license",
+        title="Amount of units spent per model and license",
+        color_discrete_map={
+            "Premium": "#edf8fb", "Basic": "#b3cde3", "Enterprise": "#8856a7", "Standard": "#810f7c"
+        }
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Model",
+        yaxis_title="Amount of units"
+    )
+    fig.update_yaxes(range=[0, 30])
+    return fig
+def plot3(df):
+    if is_sample(df):
+        stats = mean_ci(df, "spent_amount", ["feature", "model"])
+        pivot = stats.pivot(index="feature", columns="model", values="mean")
+        ci = stats.pivot(index="feature", columns="model", values="ci")
+    else:
+        pivot = df.pivot_table(
+            index="feature",
+            columns="model",
+            values="spent_amount",
+            aggfunc="mean"
+        )
+
+    fig = px.imshow(
+        pivot,
+        text_auto=".1f",
+        color_continuous_scale="BuPu",
+        aspect="auto",
+        title="Average spent amount per feature and model"
+    )
+    if is_sample(df):
+        fig.update_traces(
+            text=(pivot.round(1).astype(str) + " ± " + ci.round(1).astype(str)).to_numpy(),
+            texttemplate="%{text}",
+        )
+
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Model",
+        yaxis_title="Feature"
+    )
+    return fig
+def _model_stats_ci(sample):
+    # Weighted means with their intervals; stds are plugged in from the weighted moments.
+    squares = sample.assign(requests_sq=sample["requests_cnt"] ** 2, spend_sq=sample["spent_amount"] ** 2)
+    stats = []
+    for column, name in [("requests_cnt", "requests"), ("spent_amount", "spend")]:
+        mean = mean_ci(squares, column, "model")
+        square = mean_ci(squares, f"{name}_sq", "model")
+        std = (square["mean"] - mean["mean"] ** 2).clip(lower=0) ** 0.5
+        stats.append(mean.assign(stat=f"{name}_mean", value=mean["mean"]))
+        stats.append(mean.assign(stat=f"{name}_std", value=std, ci=float("nan")))
+    stats = pd.concat(stats)
+    order = ["requests_mean", "spend_mean", "requests_std", "spend_std"]
+    return stats.sort_values("stat", key=lambda s: s.map(order.index), kind="stable")[["model", "stat", "value", "ci"]]
+
+
+def plot4(df):
+    if is_sample(df):
+        melted = _model_stats_ci(df)
+    else:
+        stats = (
+            df.groupby("model")
+            .agg(
+                requests_mean=("requests_cnt", "mean"),
+                spend_mean=("spent_amount", "mean"),
+                requests_std=("requests_cnt", "std"),
+                spend_std=("spent_amount", "std"),
+            )
+            .reset_index()
+        )
+
+        melted = stats.melt(id_vars="model", var_name="stat", value_name="value")
+
+    fig = px.bar(
+        melted,
+        x="stat",
+        y="value",
+        color="model",
+        error_y="ci" if is_sample(df) else None,
+        barmode="group" if is_sample(df) else "relative",
+        title="Summary Statistics per Model",
+        color_discrete_sequence=px.colors.sequential.BuPu
+    )
+    return fig
+def plot5(df):
+    corr = df[["requests_cnt", "spent_amount"]].corr().iloc[0, 1]
+    title = f"Activity vs Spending (corr = {corr:.2f})"
+    if is_sample(df):
+        corr, low, high = corr_ci(df, "requests_cnt", "spent_amount")
+        title = f"Activity vs Spending (corr = {corr:.2f}, 95% CI {low:.2f}–{high:.2f})"
+
+    fig = px.scatter(
+        df,
+        x="requests_cnt",
+        y="spent_amount",
+        title=title,
+        trendline="ols",
+        opacity=0.8,
+        color_continuous_scale="BuPu"
+    )
+    fig.update_xaxes(range=[0, 6000])
+    fig.update_yaxes(range=[0, 2000])
+
+    fig.update_traces(
+        marker=dict(color="#b3cde3", size=6, line=dict(width=1, color="white")),
+        selector=dict(mode="markers")
+    )
+    return fig
+
+
+def plot6(df):
+    fig = px.scatter(
+        df,
+        x="requests_cnt",
+        y="spent_amount",
+        color="license",
+        title="Requests count per model and license",
+        trendline="ols",
+        opacity=0.8,
+        color_discrete_map={
+            "Premium": "#edf8fb",
+            "Basic": "#b3cde3",
+            "Enterprise": "#8856a7",
+            "Standard": "#810f7c"
+        }
+    )
+    return fig
+
+
+def plot7(df):
+    corr_over_time = (
+        df.groupby("day_id")[["requests_cnt", "spent_amount"]]
+        .corr().iloc[0::2, -1].reset_index()
+        .rename(columns={"spent_amount": "corr"})
+    )
+
+    fig = px.line(
+        corr_over_time,
+        x="day_id",
+        y="corr",
+        title="Daily correlation between activity and spending",
+        template="plotly_dark",
+        markers=True
+    )
+
+    fig.update_traces(
+        line=dict(color="#8856a7", width=2),
+        marker=dict(color="#b3cde3", size=6)
+    )
+
+    return fig
+
+
+def plot8(df):
+    pivot = df.pivot_table(
+        index="feature",
+        columns="model",
+        values="requests_cnt",
+        aggfunc="mean"
+    )
+
+    fig = px.imshow(
+        pivot,
+        text_auto=".1f",
+        color_continuous_scale="BuPu",
+        aspect="auto",
+        title="Average spent amount per feature and model"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Model",
+        yaxis_title="Feature"
+    )
+    return fig
+
+
+def plot9(df):
+    df = df.assign(day_id=_dates(df["day_id"]))
+    daily = df.groupby("day_id")[["requests_cnt", "spent_amount"]].sum().reset_index()
+    fig = px.line(
+        daily,
+        x="day_id",
+        y="spent_amount",
+        title="Daily Trends in Spending",
+        template="plotly_dark",
+        markers=True
+    )
+
+    fig.update_traces(
+        line=dict(color="#8856a7", width=2),
+        marker=dict(color="#b3cde3", size=6)
+    )
+    return fig
+
+
+def plot10(df):
+    day = _dates(df["day_id"])
+    df = df.assign(day_id=day, week=day.dt.to_period("W").dt.start_time)
+    weekly = df.groupby("week")[["requests_cnt", "spent_amount"]].sum().reset_index()
+    fig = px.line(
+        weekly,
+        x="week",
+        y=["requests_cnt", "spent_amount"],
+        title="Weekly Trends in Requests and Spending",
+        template="plotly_dark",
+        markers=True
+    )
+    fig.update_traces(
+        line=dict(color="#8856a7", width=2),
+        marker=dict(color="#b3cde3", size=6)
+    )
+    return fig
+
+
+def plot11(df):
+    day = _dates(df["day_id"])
+    df = df.assign(day_id=day, month=day.dt.month)
+    monthly_by_license = (
+        df.groupby(["month", "license"])[["requests_cnt", "spent_amount"]]
+        .sum()
+        .reset_index()
+    )
+    fig = px.line(
+        monthly_by_license,
+        x="month",
+        y="requests_cnt",
+        color="license",
+        title="Monthly Trends in Requests and Spending",
+        template="plotly_dark",
+        markers=True,
+        color_discrete_map={
+            "Premium": "#edf8fb",
+            "Basic": "#b3cde3",
+            "Enterprise": "#8856a7",
+            "Standard": "#810f7c"
+        }
+    )
+    return fig
+
+def plot12(df):
+    funnel = pd.DataFrame({
+        "stage": [
+            "Used app",
+            "Used multiple features",
+            "Spent > 100 credits"
+        ],
+        "users": [
+            df["uuid"].nunique(),
+            df.groupby("uuid")["feature"].nunique().gt(1).sum(),
+            df.groupby("uuid")["spent_amount"].sum().gt(100).sum()
+        ]
+    })
+
+    fig = px.funnel(
+        funnel,
+        x="users",
+        y="stage",
+        title="User Engagement Funnel",
+        template="plotly_dark",
+        color_discrete_sequence=["#8856a7"]
+    )
+    return fig
+
+
+def plot13(df):
+    user_days = activity_index(df).days_active()
+
+    fig = px.histogram(
+        user_days,
+        x="days_active",
+        color="license",
+        title="User Retention (days active) by License Type",
+        barmode="stack",
+        color_discrete_map={
+            "Premium": "#edf8fb", "Basic": "#b3cde3", "Enterprise": "#8856a7", "Standard": "#810f7c"
+        },
+        template="plotly_dark"
+    )
+
+    fig.update_layout(
+        bargap=0.2,
+        xaxis_title="Days Active",
+        yaxis_title="Number of Users",
+        legend_title="License Type"
+    )
+    return fig
+
+
+def plot14(df):
+    df = df.assign(spend_per_req=df["spent_amount"] / df["requests_cnt"])
+    avg = df.groupby("license")["spend_per_req"].mean().reset_index()
+
+    fig = px.bar(
+        avg,
+        x="license",
+        y="spend_per_req",
+        title="Average Spend per Request by License",
+        template="plotly_dark",
+        color_discrete_sequence=["#8856a7"]
+    )
+    return fig
+
+
+def plot15(df):
+    df = df.assign(spend_per_req=df["spent_amount"] / df["requests_cnt"])
+    avg = df.groupby("model")["spend_per_req"].mean().reset_index()
+
+    fig = px.bar(
+        avg,
+        x="model",
+        y="spend_per_req",
+        color_discrete_sequence=["#b3cde3"],
+        title="Average Spend per Request by Model",
+        template="plotly_dark"
+    )
+    return fig
+
+
+def plot16(df):
+    user_sum = (
+        df.groupby(["uuid", "license"])[["requests_cnt", "spent_amount"]]
+        .sum()
+        .reset_index()
+    )
+
+    user_sum["is_power"] = user_sum.groupby("license")["spent_amount"] \
+        .transform(lambda x: x > x.quantile(0.9))
+    top_users = (
+        user_sum.sort_values(["license", "spent_amount"], ascending=[True, False])
+        .groupby("license")
+        .head(5)
+    )
+
+    fig = px.bar(
+        top_users,
+        x="uuid",
+        y="spent_amount",
+        color="license",
+        title="Top 5 Power Users per License",
+        template="plotly_dark",
+        color_discrete_map={
+            "Premium": "#edf8fb", "Basic": "#b3cde3", "Enterprise": "#8856a7", "Standard": "#810f7c"
+        }
+    )
+    fig.update_layout(xaxis={"categoryorder": "total descending"})
+    return fig
+
+def plot17(df):
+    fig = px.histogram(
+        df,
+        x="feature",
+        color_discrete_sequence=["#b3cde3"],
+        title="Histogram of Features"
+    )
+    return fig
+
+
+def plot18(df):
+    fig = px.histogram(
+        df,
+        x="license",
+        color_discrete_sequence=["#810f7c"],
+        title="Histogram of Licenses"
+    )
+    return fig
+    
+def plot19(df):
+    days_active = activity_index(df).days_active()
+    avg_ret = (
+        days_active.groupby("license")["days_active"]
+        .mean()
+        .reset_index()
+    )
+    fig = px.bar(
+        avg_ret,
+        x="license",
+        y="days_active",
+        title="Average Retention (Days Active) by License",
+        template="plotly_dark",
+        color="license",
+        color_discrete_map={
+            "Premium": "#edf8fb",
+            "Basic": "#b3cde3",
+            "Enterprise": "#8856a7",
+            "Standard": "#810f7c"
+        },
+        text="days_active"
+    )
+    fig.update_traces(texttemplate="%{text:.1f}", textposition="outside")
+    fig.update_layout(
+        yaxis_title="Average days active",
+        xaxis_title="License",
+        uniformtext_minsize=10,
+        uniformtext_mode="show"
+    )
+    return fig
+
+def plot20(df):
+    user = df.groupby(["uuid", "day_id"])[["requests_cnt", "spent_amount"]].sum().reset_index()
+    summary = user.groupby("uuid")[["requests_cnt", "spent_amount"]].sum().reset_index()
+
+    req_thr = summary["requests_cnt"].median()
+    spend_thr = summary["spent_amount"].median()
+
+    def seg(row):
+        if row.requests_cnt <= req_thr and row.spent_amount <= spend_thr:
+            return "Low activity, low spend"
+        if row.requests_cnt > req_thr and row.spent_amount <= spend_thr:
+            return "High activity, low spend (free users)"
+        if row.requests_cnt <= req_thr and row.spent_amount > spend_thr:
+            return "High spend, low activity (power buyers)"
+        return "High both (core users)"
+
+    summary["segment"] = summary.apply(seg, axis=1)
+
+    merged = df.merge(summary[["uuid", "segment"]], on="uuid", how="left")
+    merged["day_id"] = pd.to_datetime(merged["day_id"])
+
+    segment_daily = merged.groupby(["day_id", "segment"])["uuid"].nunique().reset_index(name="users")
+
+    fig = px.area(
+        segment_daily,
+        x="day_id",
+        y="users",
+        color="segment",
+        title="User Behaviour Segments Over Time",
+        template="plotly_dark",
+        color_discrete_map={
+            "Low activity, low spend": "#b3cde3",
+            "High activity, low spend (free users)": "#6497b1",
+            "High spend, low activity (power buyers)": "#8856a7",
+            "High both (core users)": "#810f7c"
+        }
+    )
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Number of Users",
+        legend_title="User Segment",
+        hovermode="x unified",
+        hoverlabel=dict(bgcolor="black", font_size=12)
+    )
+
+    return fig
+
+
+def plot21(df):
+    cohorts = activity_index(df).cohort_matrix()
+
+    fig = px.imshow(
+        cohorts,
+        text_auto=".0f",
+        color_continuous_scale="BuPu",
+        aspect="auto",
+        title="Weekly Cohort Retention (% of cohort active)",
+        labels={"x": "Weeks since first activity", "y": "Cohort (first active week)", "color": "% active"}
+    )
+
+    fig.update_layout(template="plotly_dark")
+    return fig
+
+
+def scenarios(df, extra=()):
+    """
+    Projected spend under the default model routing scenarios and any extra ones.
+
+    :param df: dataset
+    :param extra: additional policies from scenarios.policy
+    :return: dict with table: DataFrame per scenario sorted by spend, spend: figure,
+        options: models, features and licenses a policy can name
+    """
+    simulator = cost_simulator(df)
+    table, by_model = simulator.run(simulator.default_policies() + list(extra))
+    order = table["spend"].argsort().to_numpy()
+    table = table.iloc[order].reset_index(drop=True)
+    spend = (
+        by_model.iloc[order]
+        .reset_index()
+        .melt(id_vars="scenario", var_name="model", value_name="spend")
+    )
+
+    fig = px.bar(
+        spend,
+        x="spend",
+        y="scenario",
+        color="model",
+        orientation="h",
+        title="Projected spend per routing scenario",
+        color_discrete_sequence=px.colors.sequential.BuPu,
+        template="plotly_dark",
+        height=max(400, 22 * len(table)),
+    )
+    fig.add_vline(x=simulator.total_spend, line_dash="dash", line_color="white")
+    fig.update_layout(xaxis_title="Spent amount", yaxis_title=None, yaxis_autorange="reversed")
+    options = {
+        "models": list(simulator.models), "features": list(simulator.features), "licenses": list(simulator.licenses),
+    }
+    return {"table": table, "spend": fig, "options": options}
+
+
+def relation_kpis(df):
+    """
+    Headline numbers of the Relation Exploration page. On a stratified sample they are
+    estimated for the full dataset, with 95% intervals.
+
+    :param df: dataset or result of sampling.stratified_sample
+    :return: dict with metrics: list of (label, value)
+    """
+    df = df.assign(spend_per_req=df["spent_amount"] / df["requests_cnt"])
+    if not is_sample(df):
+        corr = df[["requests_cnt", "spent_amount"]].corr().iloc[0, 1]
+        return {"metrics": [
+            ("Rows", f"{len(df):,}"),
+            ("Total Requests", f"{df['requests_cnt'].sum():,}"),
+            ("Total Spent", f"{df['spent_amount'].sum():,.0f}"),
+            ("Avg Spend per Request", f"{df['spend_per_req'].mean():.3f}"),
+            ("Requests/Spend corr", f"{corr:.2f}"),
+        ]}
+
+    requests, requests_ci = total_ci(df, "requests_cnt")
+    spent, spent_ci = total_ci(df, "spent_amount")
+    per_request = mean_ci(df, "spend_per_req").iloc[0]
+    corr, low, high = corr_ci(df, "requests_cnt", "spent_amount")
+    return {"metrics": [
+        ("Rows", f"{df[WEIGHT].sum():,.0f}"),
+        ("Total Requests", f"{requests:,.0f} ± {requests_ci:,.0f}"),
+        ("Total Spent", f"{spent:,.0f} ± {spent_ci:,.0f}"),
+        ("Avg Spend per Request", f"{per_request['mean']:.3f} ± {per_request['ci']:.3f}"),
+        ("Requests/Spend corr", f"{corr:.2f} ({low:.2f}–{high:.2f})"),
+    ]}
+
+
+def summary_kpis(df):
+    index = activity_index(df)
+    df = df.assign(day_id=_dates(df["day_id"]))
+
+    total_users = df["uuid"].nunique()
+    total_requests = df["requests_cnt"].sum()
+    total_spent = df["spent_amount"].sum()
+    avg_spent = df["spent_amount"].mean()
+    avg_requests = df["requests_cnt"].mean()
+    enterprise_pct = df["license"].eq("Enterprise").mean() * 100
+
+    df = df.assign(spend_per_req=df["spent_amount"] / df["requests_cnt"])
+    avg_spend_per_req = df["spend_per_req"].mean()
+    best_model = df.groupby("model")["spend_per_req"].mean().idxmin()
+    worst_model = df.groupby("model")["spend_per_req"].mean().idxmax()
+
+    avg_days_active = index.days_active(by_license=False)["days_active"].mean()
+    retained_7d = index.retention(7)
+    retained_30d = index.retention(30)
+
+    users_multiple_features = df.groupby("uuid")["feature"].nunique().gt(1).sum()
+    users_spent_over_100 = df.groupby("uuid")["spent_amount"].sum().gt(100).sum()
+    conversion_multifeature = users_multiple_features / total_users * 100
+    conversion_spender = users_spent_over_100 / total_users * 100
+
+    corr_req_spent = df[["requests_cnt", "spent_amount"]].corr().iloc[0, 1]
+    daily = df.groupby("day_id")[["requests_cnt", "spent_amount"]].sum().reset_index()
+    avg_daily_spend = daily["spent_amount"].mean()
+    peak_day = daily.loc[daily["spent_amount"].idxmax(), "day_id"].strftime("%b %d")
+    peak_spend = daily["spent_amount"].max()
+
+    user_sum = df.groupby("uuid")["spent_amount"].sum()
+    top_10pct_contrib = user_sum[user_sum > user_sum.quantile(0.9)].sum() / user_sum.sum() * 100
+
+    return {
+        "High-level usage: ": [
+            ("Total Users", f"{total_users:,}"),
+            ("Total Requests", f"{total_requests:,}"),
+            ("Total Spent", f"{total_spent:,.0f}"),
+            ("Avg Requests/User", f"{avg_requests:.1f}"),
+            ("Avg Spend/User", f"{avg_spent:.1f}"),
+        ],
+        "`Efficiency: `": [
+            ("Avg Spend per Request", f"{avg_spend_per_req:.3f}"),
+            ("Best Model (Cost-Efficient)", best_model),
+            ("Most Expensive Model", worst_model),
+            ("Enterprise % of Users", f"{enterprise_pct:.1f}%"),
+            ("Corr(Requests–Spend)", f"{corr_req_spent:.2f}"),
+        ],
+        "`Engagement: `": [
+            ("Avg Active Days/User", f"{avg_days_active:.1f}"),
+            ("Retention >7 days", f"{retained_7d:.1f}%"),
+            ("Retention >30 days", f"{retained_30d:.1f}%"),
+            ("Users Using >1 Feature", f"{conversion_multifeature:.1f}%"),
+            ("Users Spent >100", f"{conversion_spender:.1f}%"),
+        ],
+        "Power Usage: ": [
+            ("Avg Daily Spend", f"{avg_daily_spend:,.0f}"),
+            ("Peak Day", peak_day),
+            ("Peak Spending", f"{peak_spend:,.0f}"),
+            ("Top 10% Spend Share", f"{top_10pct_contrib:.1f}%"),
+            ("Most Recent Date", df["day_id"].max().strftime("%b %d")),
+        ],
+    }
+
+def summary(df):
+    user_summary = df.groupby("uuid")[["requests_cnt", "spent_amount"]].sum().reset_index()
+    req_thr = user_summary["requests_cnt"].median()
+    spend_thr = user_summary["spent_amount"].median()
+
+    def classify(row):
+        if row.requests_cnt <= req_thr and row.spent_amount <= spend_thr:
+            return "Low activity, low spend"
+        elif row.requests_cnt > req_thr and row.spent_amount <= spend_thr:
+            return "High activity, low spend (free users)"
+        elif row.requests_cnt <= req_thr and row.spent_amount > spend_thr:
+            return "High spend, low activity (power buyers)"
+        else:
+            return "High both (core users)"
+
+    user_summary["segment"] = user_summary.apply(classify, axis=1)
+    segment_counts = user_summary["segment"].value_counts().reset_index()
+    segment_counts.columns = ["segment", "users"]
+
+    fig = px.pie(
+        segment_counts,
+        names="segment",
+        values="users",
+        title="User Composition by Behaviour Segment",
+        color="segment",
+        color_discrete_map={
+            "Low activity, low spend": "#b3cde3",
+            "High activity, low spend (free users)": "#6497b1",
+            "High spend, low activity (power buyers)": "#8856a7",
+            "High both (core users)": "#810f7c"
+        }
+    )
+
+    model_stats = (
+        df.groupby("model")[["requests_cnt", "spent_amount"]]
+          .mean()
+          .sort_values("spent_amount", ascending=False)
+          .reset_index()
+    )
+
+    fig_model = px.bar(
+        model_stats,
+        x="model",
+        y="spent_amount",
+        title="Average Spend by Model",
+        text_auto=".2f",
+        template="plotly_dark",
+        color="model",
+        color_discrete_sequence=px.colors.sequential.BuPu
+    )
+
+    user_days = activity_index(df).days_active()
+    avg_retention = user_days.groupby("license")["days_active"].mean().reset_index()
+
+    fig_ret = px.bar(
+        avg_retention,
+        x="license",
+        y="days_active",
+        title="Average Retention (Days Active) by License",
+        template="plotly_dark",
+        color="license",
+        color_discrete_map={
+            "Premium": "#edf8fb",
+            "Basic": "#b3cde3",
+            "Enterprise": "#8856a7",
+            "Standard": "#810f7c"
+        },
+        text_auto=".1f"
+    )
+
+    corr = df[["requests_cnt", "spent_amount"]].corr().iloc[0, 1]
+    return {"segments": fig, "models": fig_model, "retention": fig_ret, "corr": corr}
+
+
+CHARTS = [
+    table1, plot1, plot2, plot3, plot4, plot5, plot6, plot7, plot8, plot9, plot10,
+    plot11, plot12, plot13, plot14, plot15, plot16, plot17, plot18, plot19, plot20, plot21,
+    relation_kpis, summary_kpis, summary, scenarios,
+]
@@ -0,0 +1,56 @@
+"""
+Measures how long the app's modules take to import and fails when one goes over budget.
+
+    python -m src.import_budget
+
+Each module is imported in a fresh interpreter with -X importtime after Streamlit itself,
+so the numbers are what a cold start or a first visit to a page adds on top of the server.
+"""
+import subprocess
+import sys
+
+# Milliseconds, cumulative over everything the module pulls in that Streamlit has not.
+BUDGET_MS = {
+    "src.utils": 150,
+    "src.views.overview": 50,
+    "src.views.relation": 50,
+    "src.views.trends": 50,
+    "src.views.behaviour": 50,
+    "src.views.summary": 50,
+    "src.charts": 1500,
+    "statsmodels.api": 2500,
+    "matplotlib": 1000,
+}
+
+
+def import_ms(module, preload="streamlit"):
+    """
+
+    :param module: dotted module name
+    :param preload: module imported first whose cost is not counted
+    :return: cumulative import time of module in milliseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {preload}; import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    return 0.0
+
+
+def main():
+    over = []
+    for module, budget in BUDGET_MS.items():
+        ms = import_ms(module)
+        status = "ok" if ms <= budget else "OVER"
+        print(f"{module:<24} {ms:8.1f} ms  (budget {budget} ms)  {status}")
+        if ms > budget:
+            over.append(module)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
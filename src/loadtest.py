@@ -0,0 +1,126 @@
+"""
+Drives app.py headlessly with concurrent simulated sessions and reports rerun latency.
+
+    python -m src.loadtest --sessions 8 --rounds 3 --rows 200000
+
+Every session is a Streamlit AppTest clicking through all navigation pages (via the
+?page= query parameter) in its own thread. All sessions share this process, and with it
+the data cache, like sessions of one Streamlit server do.
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PAGES = ["Overview", "Relation Exploration", "Trends over time", "User Behaviour Analysis", "Summary"]
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except OSError:
+        return float("nan")
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _session(index, rounds, timeout, start, results, errors):
+    try:
+        from streamlit.testing.v1 import AppTest
+        at = AppTest.from_file(APP, default_timeout=timeout)
+    except Exception as e:
+        errors.append((index, "setup", repr(e)))
+        # The other sessions and run() wait for every thread at the barrier.
+        start.wait()
+        return
+    start.wait()
+    for _ in range(rounds):
+        for page in PAGES:
+            at.query_params["page"] = page
+            t0 = time.perf_counter()
+            try:
+                at.run()
+            except Exception as e:
+                errors.append((index, page, repr(e)))
+                continue
+            results.append((page, time.perf_counter() - t0))
+            errors.extend((index, page, str(e.value)) for e in at.exception)
+
+
+def run(sessions, rounds, timeout=120):
+    """
+
+    :param sessions: number of concurrent simulated sessions
+    :param rounds: times each session clicks through all pages
+    :param timeout: seconds a single rerun may take
+    :return: (page, latency) pairs, errors and wall time
+    """
+    results, errors = [], []
+    start = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(target=_session, args=(i, rounds, timeout, start, results, errors), name=f"session-{i}")
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, errors, time.perf_counter() - t0
+
+
+def report(results, errors, wall_s):
+    latencies = np.array([latency for _, latency in results])
+    print(f"{'page':<26}{'reruns':>8}{'p50 s':>9}{'p99 s':>9}{'max s':>9}")
+    for page in PAGES + ["all"]:
+        page_latencies = latencies if page == "all" else np.array([l for p, l in results if p == page])
+        if not len(page_latencies):
+            continue
+        p50, p99 = np.percentile(page_latencies, [50, 99])
+        print(f"{page:<26}{len(page_latencies):>8}{p50:>9.3f}{p99:>9.3f}{page_latencies.max():>9.3f}")
+    print(f"\nthroughput: {len(results) / wall_s:.2f} reruns/s over {wall_s:.1f}s")
+    print(f"memory: {_rss_mb():,.0f} MB RSS now, {_peak_rss_mb():,.0f} MB peak")
+    for session, page, error in errors[:10]:
+        print(f"error in session {session} on {page}: {error}")
+    if len(errors) > 10:
+        print(f"... {len(errors) - 10} more errors")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=2, help="times each session visits every page")
+    parser.add_argument("--dataset", help="CSV to serve, defaults to the app's dataset")
+    parser.add_argument("--rows", type=int, help="serve a synthetic dataset of this many rows instead")
+    parser.add_argument("--with-loader", action="store_true", help="keep the loading animation delay")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args(argv)
+
+    if args.rows:
+        from src.synthetic import write_csv
+        args.dataset = os.path.join(tempfile.mkdtemp(), "synthetic.csv")
+        write_csv(args.dataset, args.rows)
+    if args.dataset:
+        os.environ["ANALYTICS_DATASET"] = os.path.abspath(args.dataset)
+    if not args.with_loader:
+        os.environ["ANALYTICS_LOADER_SECONDS"] = "0"
+
+    results, errors, wall_s = run(args.sessions, args.rounds, args.timeout)
+    report(results, errors, wall_s)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
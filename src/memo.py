@@ -0,0 +1,42 @@
+"""
+Memoisation of derived structures (indexes over the rows) per DataFrame object.
+"""
+import threading
+import weakref
+from functools import wraps
+
+_memos = []
+
+
+def per_frame(build):
+    """
+    Memoises build(df) while df is alive, so every chart of a rerun shares one result.
+    Keyed on the object, not its contents: callers must not modify df in place
+    afterwards, and a df returned again by st.cache_data is a new object.
+
+    :param build: function taking df
+    :return: memoised function with a clear() method
+    """
+    memo = {}
+    lock = threading.Lock()
+
+    @wraps(build)
+    def wrapper(df):
+        key = id(df)
+        with lock:
+            result = memo.get(key)
+        if result is None:
+            result = build(df)
+            with lock:
+                memo[key] = result
+            weakref.finalize(df, memo.pop, key, None)
+        return result
+
+    wrapper.clear = memo.clear
+    _memos.append(wrapper)
+    return wrapper
+
+
+def clear_all():
+    for memo in _memos:
+        memo.clear()
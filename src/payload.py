@@ -0,0 +1,256 @@
+"""
+Shrinks Plotly figures before they are cached and sent to the browser.
+
+    python -m src.payload data.csv
+
+prints the payload of every chart before and after slimming.
+
+- categorical histograms are replaced by bars of pre-computed counts,
+- box plots keep only their quartiles and fences instead of every row, plus up to
+  MAX_OUTLIERS outliers per box spread over their range,
+- scatter traces are thinned to a fixed number of points (trendlines are fitted
+  on the full data before thinning, so they stay exact),
+- floats are rounded to display precision and, on Plotly >= 6 where arrays are
+  sent base64-encoded, narrowed to float32/int32 where that keeps every value.
+"""
+import argparse
+from functools import wraps
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from src import profiling
+
+MAX_POINTS = 5000
+MAX_LINE_POINTS = 500
+MAX_OUTLIERS = 50
+PRECISION = 3
+
+# Plotly 6 serialises numpy arrays as typed binary arrays, where narrower dtypes
+# mean fewer bytes. Plotly 5 writes them as JSON lists, where they would not help.
+_BINARY_ARRAYS = int(plotly.__version__.split(".")[0]) >= 6
+
+_ARRAY_FIELDS = ["x", "y", "customdata", "text", "hovertext"]
+
+
+def _compact(values, precision):
+    arr = np.asarray(values)
+    if arr.dtype.kind == "f":
+        arr = np.round(arr, precision)
+        if not _BINARY_ARRAYS:
+            return arr
+        # float32 keeps about 7 significant digits, too few for large totals.
+        narrow = arr.astype(np.float32)
+        exact = np.array_equal(np.round(narrow.astype(float), precision), arr, equal_nan=True)
+        return narrow if exact else arr
+    if arr.dtype.kind in "iu" and _BINARY_ARRAYS and len(arr) and np.abs(arr).max() < 2 ** 31:
+        return arr.astype(np.int32)
+    return values
+
+
+def _histogram_counts(trace):
+    # Only count-histograms over categories; numeric ones keep Plotly's binning.
+    if trace.y is not None or trace.x is None or np.asarray(trace.x).dtype.kind in "iuf":
+        return trace
+    # Bars keep the order in which categories first appear, as Plotly orders the axis.
+    categories, first, counts = np.unique(
+        np.asarray(trace.x, dtype=object).astype(str), return_index=True, return_counts=True)
+    order = np.argsort(first, kind="stable")
+    return go.Bar(
+        x=categories[order],
+        y=counts[order],
+        name=trace.name,
+        marker=trace.marker.to_plotly_json(),
+        legendgroup=trace.legendgroup,
+        showlegend=trace.showlegend,
+        offsetgroup=trace.offsetgroup,
+        orientation="v",
+        xaxis=trace.xaxis,
+        yaxis=trace.yaxis,
+        alignmentgroup=trace.alignmentgroup,
+        hovertemplate=trace.hovertemplate,
+    )
+
+
+def _box_stats(trace, precision, max_outliers):
+    # Returns the box with precomputed statistics and a scatter of its outliers, if any.
+    # Quartiles and fences follow Plotly's default (linear) quartile method.
+    if trace.y is None or trace.x is None or trace.q1 is not None or trace.quartilemethod not in (None, "linear"):
+        return trace, None
+    x = np.asarray(trace.x, dtype=object)
+    y = np.asarray(trace.y, dtype=float)
+    groups = list(dict.fromkeys(x))
+    stats = {k: [] for k in ["q1", "median", "q3", "lowerfence", "upperfence"]}
+    outlier_x, outlier_y = [], []
+    for group in groups:
+        values = y[x == group]
+        values = values[~np.isnan(values)]
+        # Plotly interpolates at position p * n - 0.5, numpy's "hazen" method.
+        q1, median, q3 = np.percentile(values, [25, 50, 75], method="hazen")
+        iqr = q3 - q1
+        # Whiskers end at the furthest data point inside 1.5 IQR.
+        lower = min(q1, values[values >= q1 - 1.5 * iqr].min())
+        upper = max(q3, values[values <= q3 + 1.5 * iqr].max())
+        stats["q1"].append(q1)
+        stats["median"].append(median)
+        stats["q3"].append(q3)
+        stats["lowerfence"].append(lower)
+        stats["upperfence"].append(upper)
+        outside = values[(values < lower) | (values > upper)]
+        if len(outside) > max_outliers:
+            # Evenly spaced by rank, so the spread and both extremes stay visible.
+            outside = np.sort(outside)[np.unique(np.linspace(0, len(outside) - 1, max_outliers).round().astype(int))]
+        outlier_x += [group] * len(outside)
+        outlier_y += list(outside)
+    trace.update(x=groups, y=None, boxpoints=False, **{k: np.round(v, precision) for k, v in stats.items()})
+    if not outlier_y:
+        return trace, None
+    outliers = go.Scatter(
+        x=outlier_x,
+        y=np.array(outlier_y),
+        mode="markers",
+        marker={"color": trace.marker.color, "size": 4},
+        name=trace.name,
+        legendgroup=trace.legendgroup,
+        showlegend=False,
+        offsetgroup=trace.offsetgroup,
+        alignmentgroup=trace.alignmentgroup,
+        xaxis=trace.xaxis,
+        yaxis=trace.yaxis,
+        hovertemplate=trace.hovertemplate,
+    )
+    return trace, outliers
+
+
+def _thin(trace, max_points):
+    n = len(trace.x) if trace.x is not None else 0
+    if n <= max_points:
+        return trace
+    if "markers" in (trace.mode or "markers"):
+        keep = np.sort(np.random.default_rng(0).choice(n, max_points, replace=False))
+    else:
+        keep = np.unique(np.r_[np.linspace(0, n - 1, max_points).astype(int), n - 1])
+    for field in _ARRAY_FIELDS:
+        values = trace[field]
+        if values is not None and not isinstance(values, str) and len(values) == n:
+            trace[field] = np.asarray(values)[keep]
+    return trace
+
+
+def slim(fig, max_points=MAX_POINTS, max_line_points=MAX_LINE_POINTS, precision=PRECISION,
+         max_outliers=MAX_OUTLIERS):
+    """
+
+    :param fig: Plotly figure, changed in place
+    :param max_points: maximum scatter points kept in the whole figure, shared between
+        traces in proportion to their size
+    :param max_line_points: maximum points kept per line trace
+    :param precision: decimals kept for float data
+    :param max_outliers: maximum outliers drawn per box
+    :return: the slimmed figure
+    """
+    markers = [
+        len(t.x) for t in fig.data
+        if t.type in ("scatter", "scattergl") and t.x is not None and "markers" in (t.mode or "markers")
+    ]
+    total_markers = sum(markers)
+
+    traces, outliers = [], []
+    for trace in fig.data:
+        if trace.type == "histogram":
+            trace = _histogram_counts(trace)
+        elif trace.type == "box":
+            trace, box_outliers = _box_stats(trace, precision, max_outliers)
+            if box_outliers is not None:
+                outliers.append(box_outliers)
+        elif trace.type in ("scatter", "scattergl"):
+            n = len(trace.x) if trace.x is not None else 0
+            is_markers = "markers" in (trace.mode or "markers")
+            if not is_markers:
+                trace = _thin(trace, max_line_points)
+            elif total_markers > max_points:
+                trace = _thin(trace, max(1, max_points * n // total_markers))
+        for field in ["x", "y"]:
+            if field in trace and trace[field] is not None and not isinstance(trace[field], str):
+                trace[field] = _compact(trace[field], precision)
+        traces.append(trace)
+    for trace in outliers:
+        trace.y = _compact(trace.y, precision)
+    if outliers and fig.layout.boxmode == "group":
+        # Line the outliers up with their box inside each group.
+        fig.update_layout(scattermode="group", scattergap=0.3 if fig.layout.boxgap is None else fig.layout.boxgap)
+    fig.data = []
+    fig.add_traces(traces + outliers)
+    return fig
+
+
+def slim_result(result, **kwargs):
+    """
+
+    :param result: return value of a chart builder: a figure or a dict holding figures
+    :return: result with every figure slimmed
+    """
+    if isinstance(result, go.Figure):
+        return slim(result, **kwargs)
+    if isinstance(result, dict):
+        return {k: slim(v, **kwargs) if isinstance(v, go.Figure) else v for k, v in result.items()}
+    return result
+
+
+def slimmed(func):
+    """
+    Decorates a chart builder so its figures are slimmed before being returned.
+    While profiling is on, payload sizes before and after are recorded.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        with profiling.span(func.__name__, "slim") as record:
+            if profiling.is_enabled():
+                record["raw_bytes"] = _result_bytes(result)
+            result = slim_result(result)
+            if profiling.is_enabled():
+                record["figure_bytes"] = _result_bytes(result)
+        return result
+    return wrapper
+
+
+def _result_bytes(result):
+    figures = result.values() if isinstance(result, dict) else [result]
+    return sum(payload_bytes(fig) for fig in figures if isinstance(fig, go.Figure))
+
+
+def payload_bytes(fig):
+    return len(pio.to_json(fig, validate=False))
+
+
+def main(argv=None):
+    import pandas as pd
+    from src import charts
+
+    parser = argparse.ArgumentParser(description="Compare chart payload sizes before and after slimming.")
+    parser.add_argument("dataset", help="CSV with the dashboard schema")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.dataset)
+    print(f"{'chart':<20}{'full kB':>10}{'slim kB':>10}")
+    total_full = total_slim = 0
+    for build in charts.CHARTS:
+        result = build(df)
+        figures = result if isinstance(result, dict) else {"": result}
+        for key, fig in figures.items():
+            if not isinstance(fig, go.Figure):
+                continue
+            full = payload_bytes(fig)
+            small = payload_bytes(slim(fig))
+            total_full += full
+            total_slim += small
+            name = f"{build.__name__}_{key}" if key else build.__name__
+            print(f"{name:<20}{full / 1024:>10.1f}{small / 1024:>10.1f}")
+    print(f"{'total':<20}{total_full / 1024:>10.1f}{total_slim / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+_records = deque(maxlen=5000)
+_state = {"enabled": False}
+_local = threading.local()
+
+
+def set_enabled(enabled):
+    """
+    Turns profiling on or off for the whole process. Peak memory comes from tracemalloc,
+    which slows every allocation down, so it only runs while profiling is on.
+
+    :param enabled: whether spans should be recorded
+    """
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state["enabled"] = enabled
+
+
+def is_enabled():
+    return _state["enabled"]
+
+
+@contextmanager
+def span(function, phase, **fields):
+    """
+    Records wall time and peak memory of the block. The yielded dict can be filled
+    with extra fields such as cache status or figure size.
+
+    Spans can be nested: a span hands the peak it has seen so far to the enclosing
+    span before resetting the tracemalloc peak, and its own peak when it ends. Peak
+    memory is still the process-wide tracemalloc peak, so blocks running at the same
+    time in other sessions are included in each other's peaks.
+
+    :param function: name of the profiled function
+    :param phase: what the block does, e.g. "cache" or "render"
+    :return: record of the block
+    """
+    record = {"function": function, "phase": phase, **fields}
+    if not _state["enabled"]:
+        yield record
+        return
+
+    stack = _local.__dict__.setdefault("stack", [])
+    tracing = tracemalloc.is_tracing()
+    frame = {"peak": 0}
+    if tracing:
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        start_mem = tracemalloc.get_traced_memory()[0]
+    stack.append(frame)
+    record["thread"] = threading.current_thread().name
+    record["ts"] = time.time()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["wall_s"] = time.perf_counter() - start
+        stack.pop()
+        if tracing and tracemalloc.is_tracing():
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            # A concurrent span may have reset the peak below our starting point.
+            record["peak_mb"] = max(0.0, peak - start_mem) / 1024 ** 2
+        _records.append(record)
+
+
+def figure_bytes(fig):
+    return len(fig.to_json())
+
+
+def records():
+    import pandas as pd
+    return pd.DataFrame(list(_records))
+
+
+def profile_summary():
+    """
+
+    :return: per function and phase: calls, wall time, peak memory, cache hits and figure sizes
+    """
+    df = records()
+    if df.empty:
+        return df
+    for column in ["cache", "peak_mb", "raw_bytes", "figure_bytes"]:
+        if column not in df:
+            df[column] = None
+    return (
+        df.groupby(["function", "phase"])
+        .agg(
+            calls=("wall_s", "size"),
+            mean_s=("wall_s", "mean"),
+            max_s=("wall_s", "max"),
+            peak_mb=("peak_mb", "max"),
+            hits=("cache", lambda c: (c == "hit").sum()),
+            misses=("cache", lambda c: (c == "miss").sum()),
+            raw_kb=("raw_bytes", lambda b: b.max() / 1024),
+            figure_kb=("figure_bytes", lambda b: b.max() / 1024),
+        )
+        .sort_values("max_s", ascending=False)
+        .reset_index()
+    )
+
+
+def export_trace():
+    """
+
+    :return: recorded spans in Chrome trace event format, viewable in Perfetto or chrome://tracing
+    """
+    pid = os.getpid()
+    events = []
+    for record in list(_records):
+        args = {k: v for k, v in record.items() if k not in ("function", "phase", "ts", "wall_s", "thread")}
+        events.append({
+            "name": record["function"],
+            "cat": record["phase"],
+            "ph": "X",
+            "ts": record["ts"] * 1e6,
+            "dur": record["wall_s"] * 1e6,
+            "pid": pid,
+            "tid": record["thread"],
+            "args": args,
+        })
+    return json.dumps({"traceEvents": events}, default=str)
+
+
+def clear():
+    _records.clear()
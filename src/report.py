@@ -0,0 +1,142 @@
+"""
+Renders every chart and KPI block to static files without Streamlit.
+
+    python -m src.report tenant_a.csv tenant_b.csv --out reports --workers 8
+
+Each dataset gets its own folder named after the file (and its parent folder when two
+files share a name), holding one HTML file per figure, one JSON file per KPI block and
+an index.json with timings and errors. A dataset that cannot be read is reported and
+the others still render.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+import pandas as pd
+from plotly.graph_objects import Figure
+
+from src import charts
+
+
+def _to_json(value):
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient="split")
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _write(name, result, out_dir):
+    if isinstance(result, Figure):
+        path = os.path.join(out_dir, f"{name}.html")
+        result.write_html(path, include_plotlyjs="cdn", full_html=True)
+        return [path]
+
+    paths = []
+    values = {}
+    for key, value in result.items():
+        if isinstance(value, Figure):
+            paths += _write(f"{name}_{key}", value, out_dir)
+        else:
+            values[key] = value
+    if values:
+        path = os.path.join(out_dir, f"{name}.json")
+        with open(path, "w") as f:
+            json.dump(values, f, default=_to_json, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def tenant_names(paths):
+    """
+    Names tenants after their files, prefixed with the parent folder when two files
+    share a name.
+
+    :param paths: CSV paths
+    :return: one tenant name per path
+    :raises ValueError: if names still collide, e.g. the same file given twice
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    names = [
+        f"{os.path.basename(os.path.dirname(os.path.abspath(path)))}_{stem}" if stems.count(stem) > 1 else stem
+        for path, stem in zip(paths, stems)
+    ]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"several datasets would be written to the same folder: {', '.join(duplicates)}")
+    return names
+
+
+def render_dataset(task):
+    """
+    Failures to read the dataset or write its folder are recorded in the index rather
+    than raised, so one bad tenant does not stop the others.
+
+    :param task: (csv path, tenant name, output root)
+    :return: index of the files written for this dataset
+    """
+    path, tenant, out_root = task
+    out_dir = os.path.join(out_root, tenant)
+    index = {"tenant": tenant, "source": path, "rows": None, "charts": {}, "errors": {}}
+
+    start = time.perf_counter()
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        df = pd.read_csv(path)
+    except Exception as e:
+        index["errors"]["load"] = repr(e)
+        index["total_s"] = time.perf_counter() - start
+        _write_index(index, out_dir)
+        return index
+    index["rows"] = len(df)
+    index["load_s"] = time.perf_counter() - start
+
+    for build in charts.CHARTS:
+        t0 = time.perf_counter()
+        try:
+            files = _write(build.__name__, build(df), out_dir)
+        except Exception as e:
+            index["errors"][build.__name__] = repr(e)
+            continue
+        index["charts"][build.__name__] = {
+            "files": [os.path.basename(p) for p in files],
+            "seconds": time.perf_counter() - t0,
+        }
+    index["total_s"] = time.perf_counter() - start
+    _write_index(index, out_dir)
+    return index
+
+
+def _write_index(index, out_dir):
+    try:
+        with open(os.path.join(out_dir, "index.json"), "w") as f:
+            json.dump(index, f, indent=2)
+    except OSError as e:
+        index["errors"]["index"] = repr(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render dashboard charts to static HTML/JSON reports.")
+    parser.add_argument("datasets", nargs="+", help="CSV files with the dashboard schema, one per tenant")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    try:
+        tenants = tenant_names(args.datasets)
+    except ValueError as e:
+        parser.error(str(e))
+    tasks = [(path, tenant, args.out) for path, tenant in zip(args.datasets, tenants)]
+    failed = 0
+    with multiprocessing.Pool(min(args.workers, len(tasks))) as pool:
+        for index in pool.imap_unordered(render_dataset, tasks):
+            failed += bool(index["errors"])
+            status = "errors: " + ", ".join(index["errors"]) if index["errors"] else "ok"
+            print(f"{index['tenant']}: {len(index['charts'])} charts in {index['total_s']:.1f}s ({status})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
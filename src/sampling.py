@@ -0,0 +1,124 @@
+"""
+Stratified sampling by license x model with design-based confidence intervals.
+
+The sample keeps a sample_weight column (rows in the stratum / rows sampled from it).
+Means are estimated per domain (e.g. per model, or per feature and model) with the
+usual stratified estimator, and their variance by linearization, so domains that cut
+across strata, like features, also get intervals.
+"""
+import numpy as np
+import pandas as pd
+
+STRATA = ["license", "model"]
+WEIGHT = "sample_weight"
+Z_95 = 1.96
+
+
+def stratified_sample(df, size=200_000, min_per_stratum=30, seed=0):
+    """
+    Draws a proportional sample from every license x model stratum, with at least
+    min_per_stratum rows (or the whole stratum if smaller).
+
+    :param df: dataset
+    :param size: approximate total number of sampled rows
+    :param min_per_stratum: lower bound on rows drawn from each stratum
+    :param seed: random seed
+    :return: sampled rows with a sample_weight column
+    """
+    rng = np.random.default_rng(seed)
+    fraction = min(1.0, size / max(len(df), 1))
+    parts, weights = [], []
+    for _, rows in df.groupby(STRATA, sort=False).indices.items():
+        n = min(len(rows), max(min_per_stratum, round(len(rows) * fraction)))
+        parts.append(rng.choice(rows, n, replace=False) if n < len(rows) else rows)
+        weights.append(np.full(n, len(rows) / n))
+    positions = np.concatenate(parts)
+    order = np.argsort(positions)
+    return df.iloc[positions[order]].assign(**{WEIGHT: np.concatenate(weights)[order]})
+
+
+def is_sample(df):
+    return WEIGHT in df
+
+
+def _strata(sample):
+    h = sample.groupby(STRATA, sort=False).ngroup().to_numpy()
+    w = sample[WEIGHT].to_numpy()
+    n_h = np.bincount(h)
+    N_h = np.bincount(h, weights=w)
+    return h, w, n_h, N_h
+
+
+def _variance(u, h, n_h, N_h):
+    # Stratified variance of the estimated total of u, with finite population correction.
+    s1 = np.bincount(h, weights=u, minlength=len(n_h))
+    s2 = np.bincount(h, weights=u * u, minlength=len(n_h))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var_h = np.where(n_h > 1, (s2 - s1 ** 2 / n_h) / (n_h - 1), 0.0)
+    return float(np.sum(N_h ** 2 * (1 - n_h / N_h) * np.maximum(var_h, 0) / n_h))
+
+
+def mean_ci(sample, value, by=None):
+    """
+
+    :param sample: result of stratified_sample
+    :param value: column to average
+    :param by: column or list of columns defining domains, None for the whole population
+    :return: DataFrame with the by columns, mean and ci (half-width of the 95% interval)
+    """
+    h, w, n_h, N_h = _strata(sample)
+    y = sample[value].to_numpy(dtype=float)
+    domains = {None: np.arange(len(sample))} if by is None else sample.groupby(by, sort=True).indices
+
+    rows = []
+    for key, idx in domains.items():
+        N_d = w[idx].sum()
+        mean = np.dot(w[idx], y[idx]) / N_d
+        u = np.zeros(len(sample))
+        u[idx] = (y[idx] - mean) / N_d
+        ci = Z_95 * np.sqrt(_variance(u, h, n_h, N_h))
+        row = {"mean": mean, "ci": ci}
+        if by is not None:
+            row.update(zip([by] if isinstance(by, str) else by, key if isinstance(key, tuple) else (key,)))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def total_ci(sample, value):
+    """
+
+    :param sample: result of stratified_sample
+    :param value: column to sum
+    :return: (estimated population total, half-width of the 95% interval)
+    """
+    h, w, n_h, N_h = _strata(sample)
+    y = sample[value].to_numpy(dtype=float)
+    return float(np.dot(w, y)), Z_95 * np.sqrt(_variance(y, h, n_h, N_h))
+
+
+def _weighted_corr(x, y, w):
+    mx, my = np.average(x, weights=w), np.average(y, weights=w)
+    cov = np.average((x - mx) * (y - my), weights=w)
+    return cov / np.sqrt(np.average((x - mx) ** 2, weights=w) * np.average((y - my) ** 2, weights=w))
+
+
+def corr_ci(sample, x, y, groups=20, seed=0):
+    """
+    Weighted Pearson correlation with a delete-a-group jackknife interval. Fisher's z
+    assumes normal data and is far too narrow for the heavy-tailed usage columns.
+
+    :param sample: result of stratified_sample
+    :param x: first column
+    :param y: second column
+    :param groups: number of random groups left out in turn
+    :param seed: random seed for the group assignment
+    :return: (correlation, low, high)
+    """
+    xs = sample[x].to_numpy(dtype=float)
+    ys = sample[y].to_numpy(dtype=float)
+    w = sample[WEIGHT].to_numpy()
+    r = _weighted_corr(xs, ys, w)
+    group = np.random.default_rng(seed).integers(0, groups, len(sample))
+    replicates = np.array([_weighted_corr(xs[keep], ys[keep], w[keep]) for keep in (group != g for g in range(groups))])
+    se = np.sqrt((groups - 1) / groups * np.sum((replicates - replicates.mean()) ** 2))
+    return float(r), float(max(-1.0, r - Z_95 * se)), float(min(1.0, r + Z_95 * se))
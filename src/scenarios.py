@@ -0,0 +1,198 @@
+"""
+Projects total spend if requests were routed to other models.
+
+A policy moves the requests of some features, licenses and source models to a target
+model (a fixed one or the cheapest per feature), optionally only rows spending at least
+min_spend. A moved row costs its spend scaled by the ratio of per-request prices
+(spent / requests per model and feature) of the target and the current model, so users'
+own deviations from the average price are kept.
+
+Rows are sorted once by (license, feature, model) cell and spend. Any batch of policies
+is then evaluated together: one searchsorted finds, per policy and cell, where the
+budget threshold falls, and prefix sums give the spend above it.
+
+    python -m src.scenarios data.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.memo import per_frame
+
+CHEAPEST = "cheapest"
+
+
+def policy(name, to=CHEAPEST, features=None, licenses=None, models=None, min_spend=0.0):
+    """
+
+    :param name: label of the scenario
+    :param to: target model, or "cheapest" for the cheapest model of each feature
+    :param features: features whose requests are moved, None for all
+    :param licenses: licenses whose requests are moved, None for all
+    :param models: models requests are moved away from, None for all
+    :param min_spend: only move rows spending at least this much
+    :return: policy dict
+    """
+    return {
+        "name": name, "to": to, "features": features, "licenses": licenses,
+        "models": models, "min_spend": float(min_spend),
+    }
+
+
+class CostSimulator:
+    def __init__(self, df):
+        """
+
+        :param df: dataset with license, feature, model, requests_cnt and spent_amount
+        """
+        license_codes, self.licenses = pd.factorize(df["license"], sort=True)
+        feature_codes, self.features = pd.factorize(df["feature"], sort=True)
+        model_codes, self.models = pd.factorize(df["model"], sort=True)
+        L, F, M = len(self.licenses), len(self.features), len(self.models)
+
+        spend = df["spent_amount"].to_numpy(dtype=float)
+        requests = df["requests_cnt"].to_numpy(dtype=float)
+        cell = (license_codes * F + feature_codes) * M + model_codes
+        self.shape = (L, F, M)
+
+        # Per-request price of every model for every feature.
+        mf = model_codes * F + feature_codes
+        spend_mf = np.bincount(mf, weights=spend, minlength=M * F).reshape(M, F)
+        requests_mf = np.bincount(mf, weights=requests, minlength=M * F).reshape(M, F)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.price = spend_mf / requests_mf
+
+        # Sort by cell, then spend. Keys are integers, cell * K + rank of the spend among
+        # distinct values, so thresholds compare exactly with the data.
+        self._values, ranks = np.unique(spend, return_inverse=True)
+        self._K = len(self._values) + 1
+        keys = cell.astype(np.int64) * self._K + ranks.reshape(-1)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._spend_cum = np.r_[0, np.cumsum(spend[order])]
+        self._requests_cum = np.r_[0, np.cumsum(requests[order])]
+        self._cell_end = np.searchsorted(self._keys, np.arange(1, L * F * M + 1) * self._K, side="left")
+        self.total_spend = float(self._spend_cum[-1])
+        self.total_requests = float(self._requests_cum[-1])
+
+    def cheapest(self):
+        """
+
+        :return: code of the cheapest model for every feature
+        """
+        return np.nanargmin(np.where(np.isnan(self.price), np.inf, self.price), axis=0)
+
+    def _targets(self, policies):
+        # Target model code per policy and cell, -1 where the policy leaves the cell alone.
+        L, F, M = self.shape
+        targets = np.full((len(policies), L, F, M), -1)
+        cheapest = self.cheapest()
+        for i, p in enumerate(policies):
+            lic = self.licenses.isin(p["licenses"]) if p["licenses"] is not None else np.ones(L, bool)
+            feat = self.features.isin(p["features"]) if p["features"] is not None else np.ones(F, bool)
+            mod = self.models.isin(p["models"]) if p["models"] is not None else np.ones(M, bool)
+            to = cheapest if p["to"] == CHEAPEST else np.full(F, self.models.get_loc(p["to"]))
+            selected = lic[:, None, None] & feat[None, :, None] & mod[None, None, :]
+            targets[i] = np.where(selected, to[None, :, None], -1)
+        return targets.reshape(len(policies), -1)
+
+    def run(self, policies):
+        """
+        Evaluates all policies in one pass over the sorted cells.
+
+        :param policies: list of policy dicts
+        :return: (DataFrame per policy with projected spend, saving and share of moved
+            requests; DataFrame policies x models of projected spend)
+        """
+        L, F, M = self.shape
+        S, C = len(policies), L * F * M
+        targets = self._targets(policies)
+        budgets = np.array([p["min_spend"] for p in policies])
+
+        cells = np.arange(C)
+        thresholds = cells[None, :] * self._K + np.searchsorted(self._values, budgets, side="left")[:, None]
+        position = np.searchsorted(self._keys, thresholds, side="left")
+        end = self._cell_end[None, :]
+        moved_spend = self._spend_cum[end] - self._spend_cum[position]
+        moved_requests = self._requests_cum[end] - self._requests_cum[position]
+
+        source = cells % M
+        feature = cells // M % F
+        keep = (targets < 0) | (targets == source[None, :])
+        target = np.where(keep, source[None, :], targets)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            factor = self.price[target, feature[None, :]] / self.price[source[None, :], feature[None, :]]
+        factor = np.where(keep | ~np.isfinite(factor), 1.0, factor)
+        moved_spend = np.where(keep, 0.0, moved_spend)
+        moved_requests = np.where(keep, 0.0, moved_requests)
+
+        cell_spend = np.diff(np.r_[0, self._spend_cum[self._cell_end]])
+        by_model = np.zeros((S, M))
+        rows = np.broadcast_to(np.arange(S)[:, None], (S, C))
+        np.add.at(by_model, (rows, np.broadcast_to(source, (S, C))), cell_spend[None, :] - moved_spend)
+        np.add.at(by_model, (rows, target), moved_spend * factor)
+
+        spend = by_model.sum(axis=1)
+        result = pd.DataFrame({
+            "scenario": [p["name"] for p in policies],
+            "spend": spend,
+            "saving": self.total_spend - spend,
+            "saving_pct": (1 - spend / self.total_spend) * 100 if self.total_spend else 0.0,
+            "moved_requests_pct": moved_requests.sum(axis=1) / self.total_requests * 100 if self.total_requests else 0.0,
+        })
+        return result, pd.DataFrame(by_model, index=result["scenario"], columns=list(self.models))
+
+    def default_policies(self):
+        """
+        Baseline plus routing to the cheapest model overall, per license, away from each
+        model, above spend quantiles, and between every pair of models.
+
+        :return: list of policy dicts
+        """
+        spend = self._values[self._keys % self._K]
+        policies = [policy("Baseline", licenses=[])]
+        policies.append(policy("All to cheapest"))
+        policies += [policy(f"{lic} to cheapest", licenses=[lic]) for lic in self.licenses]
+        policies += [policy(f"{model} to cheapest", models=[model]) for model in self.models]
+        for q in [50, 75, 90, 99]:
+            budget = np.percentile(spend, q) if len(spend) else 0.0
+            policies.append(policy(f"Spend ≥ {budget:.1f} (p{q}) to cheapest", min_spend=budget))
+        policies += [
+            policy(f"{source} to {target}", to=target, models=[source])
+            for source in self.models for target in self.models if source != target
+        ]
+        return policies
+
+
+@per_frame
+def cost_simulator(df):
+    """
+    CostSimulator for df, shared by every call of a rerun.
+
+    :param df: dataset
+    :return: CostSimulator
+    """
+    return CostSimulator(df)
+
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Project spend under model routing scenarios.")
+    parser.add_argument("dataset", help="CSV with the dashboard schema")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.dataset)
+    t0 = time.perf_counter()
+    simulator = CostSimulator(df)
+    t1 = time.perf_counter()
+    policies = simulator.default_policies()
+    result, _ = simulator.run(policies)
+    t2 = time.perf_counter()
+    print(result.sort_values("spend").to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+    print(f"\n{len(df):,} rows: index built in {t1 - t0:.2f}s, {len(policies)} scenarios evaluated in {(t2 - t1) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Synthetic datasets with the dashboard schema, for benchmarks and load tests.
+
+    python -m src.synthetic 1000000 --out synthetic_1m.csv
+
+Spending follows a power law across users: a few heavy users account for most
+requests and credits, like in the real dataset.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+MODELS = ["Model_A", "Model_B", "Model_C", "Model_D", "Model_E"]
+MODEL_WEIGHTS = [0.08, 0.07, 0.33, 0.32, 0.20]
+# Credits per request, A and B are the expensive models.
+MODEL_PRICE = [0.34, 0.33, 0.19, 0.18, 0.19]
+
+FEATURES = ["Feature_1", "Feature_2", "Feature_3", "Feature_4", "Feature_5"]
+FEATURE_WEIGHTS = [0.40, 0.22, 0.18, 0.12, 0.08]
+FEATURE_PRICE = [1.0, 1.0, 1.0, 1.6, 1.1]
+
+LICENSES = ["Basic", "Standard", "Premium", "Enterprise"]
+LICENSE_WEIGHTS = [0.35, 0.30, 0.20, 0.15]
+LICENSE_ACTIVITY = [0.6, 0.8, 1.6, 1.4]
+
+
+def population(users, seed=0):
+    """
+
+    :param users: number of distinct users
+    :param seed: random seed
+    :return: (license index, activity multiplier) per user
+    """
+    rng = np.random.default_rng(seed)
+    user_license = rng.choice(len(LICENSES), size=users, p=LICENSE_WEIGHTS)
+    # Pareto activity makes both row counts and spend per user heavy tailed.
+    user_activity = (rng.pareto(1.5, size=users) + 1) * np.take(LICENSE_ACTIVITY, user_license)
+    return user_license, user_activity
+
+
+def generate(rows, users=None, days=120, start="2024-02-01", seed=0, users_population=None):
+    """
+
+    :param rows: number of rows
+    :param users: number of distinct users, defaults to one per 60 rows
+    :param days: length of the period covered
+    :param start: first day_id
+    :param seed: random seed
+    :param users_population: result of population(), to share users between calls
+    :return: DataFrame with uuid, day_id, model, feature, license, requests_cnt, spent_amount
+    """
+    if users_population is None:
+        users_population = population(users or max(10, rows // 60), seed)
+    user_license, user_activity = users_population
+    rng = np.random.default_rng([seed, 1])
+
+    user = rng.choice(len(user_license), size=rows, p=user_activity / user_activity.sum())
+    license_idx = user_license[user]
+
+    # Fewer rows fall on weekends.
+    calendar = pd.date_range(start, periods=days, freq="D")
+    day_weights = np.where(calendar.dayofweek < 5, 1.0, 0.15)
+    day = rng.choice(days, size=rows, p=day_weights / day_weights.sum())
+
+    model = rng.choice(len(MODELS), size=rows, p=MODEL_WEIGHTS)
+    feature = rng.choice(len(FEATURES), size=rows, p=FEATURE_WEIGHTS)
+
+    requests_cnt = np.maximum(1, rng.lognormal(2.5, 1.0, size=rows) * np.sqrt(user_activity[user])).astype(np.int64)
+    price = np.take(MODEL_PRICE, model) * np.take(FEATURE_PRICE, feature)
+    spent_amount = np.round(requests_cnt * price * rng.lognormal(0.0, 0.25, size=rows), 2)
+
+    return pd.DataFrame({
+        "uuid": np.char.add("user_", user.astype(str)),
+        "day_id": calendar.strftime("%Y-%m-%d").values[day],
+        "model": np.take(MODELS, model),
+        "feature": np.take(FEATURES, feature),
+        "license": np.take(LICENSES, license_idx),
+        "requests_cnt": requests_cnt,
+        "spent_amount": spent_amount,
+    }).astype({"uuid": object, "day_id": object, "model": object, "feature": object, "license": object})
+
+
+def write_csv(path, rows, users=None, chunk_rows=1_000_000, seed=0, **kwargs):
+    """
+    Writes a dataset too large to hold in memory chunk by chunk. Chunks share the user
+    population, so users stay consistent across the whole file.
+
+    :param path: output CSV path
+    :param rows: total number of rows
+    :param users: number of distinct users, defaults to one per 60 rows
+    :param chunk_rows: rows generated per chunk
+    :param seed: random seed of the first chunk
+    :return: number of rows written
+    """
+    users_population = population(users or max(10, rows // 60), seed)
+    written = 0
+    for i, offset in enumerate(range(0, rows, chunk_rows)):
+        chunk = generate(min(chunk_rows, rows - offset), seed=seed + i, users_population=users_population, **kwargs)
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        written += len(chunk)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset with the dashboard schema.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--out", default="synthetic.csv")
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    written = write_csv(args.out, args.rows, users=args.users, days=args.days, seed=args.seed)
+    print(f"wrote {written:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import streamlit as st
+
+from src.utils import plot12, plot13, plot14, plot15, plot16, plot19, plot21
+
+
+def render(df):
+    plot12(df)
+    st.markdown("""There are three engagement stages:
+* Used app – 1866 users
+ > Total number of users who have been active at least once.
+* Used multiple features – 1802 users
+ > Most users (≈97%) explored more than one functionality.
+* Spent > 100 credits – 1452 users
+ > Around 78% of users transitioned into meaningful spending behavior.
+    """)
+    plot13(df)
+    st.markdown("""
+    * The retention distribution suggests that while some users drop off quickly, the majority are staying active for more than a month.
+    * Premium and Enterprise users make up a huge portion of long-term active users, implying that higher-tier licenses correlate with stronger retention.
+    * Basic and Standard licenses dominate the early days but taper off, indicating that casual or trial users stop usage earlier.
+    
+    We can see a bimodal-like pattern:
+    * A smaller group of users who were active for only a few days (low retention).
+    * A dominant peak around 40–50 days active, where most users concentrated — showing consistent engagement over time.
+    """)
+    plot19(df)
+    st.markdown("""
+    We can observe another plot in favour of statement that higher-tier licenses correlate with stronger retention as the median of premium and enterprise users is much higher than that of standard and basic tier. 
+    """)
+    plot21(df)
+    st.markdown("""
+    Each row is a cohort of users who were first active in the same week, each column the number of weeks since then.
+    * The first column is always 100% — every user is active in the week they joined.
+    * Reading a row from left to right shows how quickly a cohort drops off, reading a column from top to bottom shows whether newer cohorts stay as long as older ones.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        plot14(df)
+    with col2:
+        plot15(df)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("""
+        * The average spend per request is nearly identical across all license types — Basic, Standard, Premium, and Enterprise.
+        
+        * This suggests that the cost structure is consistent regardless of user tier; all licenses likely share the same pricing per request or resource usage rate.
+        
+        * Therefore, total spending differences between licenses are mainly driven by volume of requests, not per-request pricing.
+        """)
+    with col2:
+        st.markdown("""
+        A clear variation is visible here:
+        * Model A and Model B have the highest per-request spending, around 0.33–0.35 units.
+        
+        * Models C, D, and E cluster lower, around 0.18–0.19 units.
+        
+        * This implies that different models have different cost or resource demands, possibly reflecting computational complexity.
+        """)
+    plot16(df)
+    st.markdown("""
+    * The Premium and Enterprise licenses dominate the top spenders, suggesting that higher-tier licenses correlate with heavier usage and greater spending power.
+    * The leading Premium user (user_935) stands out significantly, spending over 50k units, well above others — a potential super-user or enterprise-level account.
+    * The long tail of smaller spenders confirms a power-law distribution, where a small minority of users account for the majority of total spending.""")
@@ -0,0 +1,34 @@
+import streamlit as st
+
+from src.utils import load, plot17, plot18, table1
+
+
+def render(df):
+    st.subheader("Project Overview")
+    load("Visualisation loaded")
+
+    table1(df)
+    st.markdown("""
+    The heatmap shows that user activity is concentrated around Models C and D, particularly for high-demand features such as Feature_1 and Feature_4.
+This suggests that these models are likely perceived as the most efficient or accurate for the platform’s core tasks.
+In contrast, Models A and B display consistently lower engagement, indicating limited or specialized usage.
+Overall, the system shows strong model–feature alignment, where user preferences reveal which combinations deliver the most value.
+    """)
+    col1, col2 = st.columns(2)
+    with col1:
+        plot17(df)
+    with col2:
+        plot18(df)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("""
+        * Feature_1 is by far the most frequently used, followed by Feature_2 and Feature_3.
+        * Feature_4 and Feature_5 have significantly fewer counts, suggesting they are more specialized or less frequently needed.
+        * It suggests that users rely heavily on a limited set of key features while others remain underutilized.
+        """)
+    with col2:
+        st.markdown("""
+        * The Basic and Standard license types dominate the user base, with the highest activity counts.
+        * Premium and Enterprise licenses appear smaller in volume, suggesting a smaller but possibly higher-value user segment.
+        """)
@@ -0,0 +1,75 @@
+import streamlit as st
+
+from src.utils import SAMPLE_ROWS, load, plot1, plot2, plot3, plot4, plot5, plot6, relation_kpis, sample_data, sampled_by_default
+
+
+def render(df):
+    st.subheader("Relation Exploration")
+    load()
+    st.write("Exploring relationships between models, licenses, and features with key metrics like requests_cnt and spent_amount.")
+    exact = len(df) <= SAMPLE_ROWS or st.toggle(
+        "Exact computation",
+        value=not sampled_by_default(df),
+        help="Off: charts below are computed from a stratified sample by license and model.",
+    )
+    if not exact:
+        full = df
+        df = sample_data(full)
+        st.caption(
+            f"Approximate: stratified sample of {len(df):,} out of {len(full):,} rows by license × model. "
+            "± values and error bars are 95% confidence intervals for the full dataset."
+        )
+    relation_kpis(df)
+    plot1(df)
+
+    st.markdown("""
+        * **Premium** and **Enterprise** licenses generally show higher median request counts, indicating heavier or more consistent usage.
+        * **Basic** and **Standard users** tend to have lower medians and wider variability, suggesting irregular or lower-intensity usage.
+        * Models such as Model_D and Model_C exhibit broader distributions across license types, reflecting a diverse range of user behaviors.
+        * Model_A and Model_B have comparatively narrower spreads for most licenses, implying more uniform request patterns.
+        """)
+    st.write("**This suggests that usage patterns scale predictably with license tier, reflecting clear segmentation of user engagement levels.**")
+    plot2(df)
+    st.write(" While usage frequency (requests) varies among models, the volume or size of processed units is more stable across different models.")
+    st.markdown("""
+        * Premium and Enterprise licenses consistently show higher medians and wider ranges, indicating greater engagement and workload capacity.
+        * Basic and Standard licenses cluster at lower values, reflecting lighter or less consistent activity — a pattern consistent across both requests and units.
+        """)
+    st.write("Both charts suggest that Premium and Enterprise users generate both higher frequency and higher usage, confirming their higher system utilization.")
+    plot3(df)
+    st.markdown("""
+    * Model_C and Model_D dominate overall spending particularly in feature 4
+    * Across all models, Feature_4 consistently records above-average spending, peaking at 22.8 for Model_C.
+    * Model_B displays generally lower average spending across all features, with a notably low value (4.4) for Feature_4.
+    * Model_E maintains consistent mid-range values across features (7.9–13.5), suggesting a stable, balanced approach to feature cost allocation. It might be general-purpose model.
+    """)
+    plot4(df)
+    st.markdown("""
+    * requests_mean:  
+     
+     We can observe the highest mean request usage for model C and D and the lowest for model A and B.
+    * spend mean
+    
+    It is around the same for all the models which means that amount of units (credits) spent within the day per model is equal.
+    * requests std
+    
+    It is similarly to mean, the highest for model C and D but differently lowest for E and A.
+    * spend std
+    
+    It is the highest for model C with the value of 51 and the lowest for model E with 12.
+    """)
+    st.write("Models C and D demonstrate the highest mean request usage and largest variability, indicating that they are the most actively and diversely used models across the user base. In contrast, Models A and B record the lowest request means, suggesting limited adoption or more specialized use. Interestingly, the average spending per model remains relatively consistent, which implies a balanced credit consumption rate — users spend roughly the same amount per day regardless of the model they use. However, variability in spending (standard deviation) differs: Model C shows the highest fluctuation in spending (std = 51), likely reflecting diverse usage intensities or premium feature use, while Model E maintains the most stable and lowest spending variance (std = 12), indicating predictable or limited usage patterns.")
+    plot5(df)
+    st.markdown("""
+    A strong positive correlation (r = 0.94) reveals that spending grows almost linearly with user activity, it indicates a clear usage-based pricing model. 
+    Users who submit more requests consistently spend more which we would expect to happen. The imperfections around the line might have been caused by different licenses and features.
+    * Above the line -> users relying on premium or higher-cost models.
+    * Below the line -> users utilizing lower-cost or limited features.
+    """)
+    plot6(df)
+    st.markdown("""
+    Now let's see it broken down by license! Each color represents a different license, with its own regression line showing how spending scales with request volume within that membership.
+    * Premium users maintain the highest overall spending and extend furthest along the request axis, indicating heavy and consistent engagement.
+    * Enterprise users show a steeper slope, suggesting that each request costs more on average — likely due to advanced or higher-value features.
+    * Basic and Standard users cluster near the origin, reflecting limited usage and minimal spending.
+    """)
@@ -0,0 +1,7 @@
+from src.utils import scenarios, summary, summary_kpis
+
+
+def render(df):
+    summary_kpis(df)
+    summary(df)
+    scenarios(df)
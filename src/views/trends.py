@@ -0,0 +1,43 @@
+import streamlit as st
+
+from src.utils import plot7, plot9, plot10, plot11, plot20
+
+
+def render(df):
+    plot7(df)
+    st.markdown("""
+    The correlation remains consistently high (≈0.9–1.0), indicating a stable and predictable relationship between activity and spending.
+    Possible causes of flactuations are:
+    * Users might shift temporarily toward cheaper models or features - Activity (requests) goes up, but spending doesn’t rise as fast so we observe lower correlation.
+    * Around weekends, holidays, or updates, users might test or interact differently — producing non-representative activity spikes.
+    """)
+    plot9(df)
+    st.markdown("""
+    The clear peaks and troughs suggest a repeating weekly cycle. Spending raises for several consecutive days, then drops almost to zero before rising again.
+    This likely reflects weekly usage behavior, such as:
+    * Higher activity during workdays (when models are used for production, analysis, or operations),
+    * Lower or no usage on weekends (when users are inactive or systems are paused).
+""")
+    plot10(df)
+    st.markdown("""
+    * After a sharp increase early in the observed period (around late February–early March), values stabilize with small fluctuations.
+    * Spending and requests move in sync — when request volume rises, spending follows.
+    """)
+    plot11(df)
+    st.markdown("""
+    * Across all license types, total requests increase steadily month over month, indicating growing engagement.
+    * Premium users consistently record the highest request counts, followed by Enterprise and Standard, while Basic users remain the least active but still show significant growth.
+    """)
+    plot20(df)
+    st.markdown("""
+            * Dominant segment:
+        > The “High activity, low spend (free users)” group consistently forms the largest portion of active users, suggesting that most engagement comes from non-paying users.
+        * Stable core users:
+        > The “High both (core users)” segment remains stable throughout the period, showing a loyal, consistent base of active and paying users.
+        * Limited power buyers:
+        > The “High spend, low activity” group stays small and steady, indicating few high-value but low-engagement customers.
+        * Low engagement segment persistence:
+        > The “Low activity, low spend” area is minor but continuous, reflecting users who occasionally return but don’t contribute significantly to overall activity.
+        * Growth trend:
+        > Toward late May, total user volume slightly increases, mainly driven by free and core users, hinting at growing engagement.
+            """)
@@ -0,0 +1,49 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_progress = {}
+
+
+def warm_up(df, key, builders, expired=False):
+    """
+    Runs every builder once on df in a background thread so their cache entries exist
+    before a page asks for them. Each dataset version (key) is warmed once, and again
+    when expired is set after the previous warm-up finished.
+
+    :param df: dataset the pages will be rendered from
+    :param key: identifies the dataset version, e.g. path and modification time
+    :param builders: cached chart functions taking df
+    :param expired: whether cache entries from the last warm-up have been dropped
+    :return: progress dict for key
+    """
+    with _lock:
+        state = _progress.get(key)
+        if state is not None and not (expired and state["finished"]):
+            return state
+        state = {"done": 0, "total": len(builders), "failed": [], "started": time.time(), "finished": None}
+        _progress[key] = state
+
+    thread = threading.Thread(target=_run, args=(df, builders, state), name="cache-warmup", daemon=True)
+    thread.start()
+    return state
+
+
+def _run(df, builders, state):
+    for build in builders:
+        try:
+            build(df)
+        except Exception:
+            logger.exception("Warm-up failed for %s", build.__name__)
+            state["failed"].append(build.__name__)
+        with _lock:
+            state["done"] += 1
+    state["finished"] = time.time()
+
+
+def warm_up_status(key):
+    with _lock:
+        return dict(_progress.get(key, {}))
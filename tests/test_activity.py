@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from src.activity import ActivityIndex
+from src.synthetic import generate
+
+
+@pytest.fixture(scope="module")
+def df():
+    df = generate(20_000, 500, seed=2)
+    # The generator gives every user one license; move part of two users' history to
+    # other licenses, on both shared and new days.
+    upgraded = df["uuid"] == df["uuid"].iloc[0]
+    middle = df.loc[upgraded, "day_id"].sort_values().iloc[upgraded.sum() // 2]
+    df.loc[upgraded & (df["day_id"] > middle), "license"] = "Upgraded"
+    extra = df[df["uuid"] == df["uuid"].iloc[1]].head(20).assign(license="Trial", day_id="2024-01-01")
+    return pd.concat([df, extra, extra.assign(license="Upgraded")], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def index(df):
+    return ActivityIndex.from_frame(df)
+
+
+def test_has_users_with_several_licenses(df):
+    assert df.groupby("uuid")["license"].nunique().max() > 1
+
+
+def test_days_active_by_license(df, index):
+    expected = df.groupby(["uuid", "license"])["day_id"].nunique()
+    result = index.days_active().set_index(["uuid", "license"])["days_active"]
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(), check_names=False)
+
+
+def test_days_active_per_user(df, index):
+    expected = df.groupby("uuid")["day_id"].nunique()
+    result = index.days_active(by_license=False).set_index("uuid")["days_active"]
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(), check_names=False)
+
+
+def test_first_last_seen(df, index):
+    days = pd.to_datetime(df["day_id"])
+    expected = days.groupby(df["uuid"]).agg(["min", "max"])
+    result = index.first_last_seen().set_index("uuid").sort_index()
+    pd.testing.assert_series_equal(result["first_seen"], expected["min"].sort_index(), check_names=False)
+    pd.testing.assert_series_equal(result["last_seen"], expected["max"].sort_index(), check_names=False)
+
+
+@pytest.mark.parametrize("n", [0, 7, 30])
+def test_retention(df, index, n):
+    user_days = df.groupby("uuid")["day_id"].nunique()
+    assert index.retention(n) == pytest.approx((user_days > n).mean() * 100)
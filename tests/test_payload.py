@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import pytest
+
+from src import payload
+from src.payload import slim
+
+
+def _plotly_box(values):
+    # Port of plotly.js box/calc.js for the default "linear" quartile method.
+    values = np.sort(values)
+    n = len(values)
+
+    def interp(p):
+        i = p * n - 0.5
+        if i < 0:
+            return values[0]
+        if i > n - 1:
+            return values[-1]
+        frac = i % 1
+        return frac * values[int(np.ceil(i))] + (1 - frac) * values[int(np.floor(i))]
+
+    q1, median, q3 = interp(0.25), interp(0.5), interp(0.75)
+    lower = min(q1, values[np.searchsorted(values, 2.5 * q1 - 1.5 * q3, side="left")])
+    upper = max(q3, values[np.searchsorted(values, 2.5 * q3 - 1.5 * q1, side="right") - 1])
+    return {"q1": q1, "median": median, "q3": q3, "lowerfence": lower, "upperfence": upper}
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    sizes = {"b": 7, "a": 1_000, "c": 2}
+    return pd.DataFrame({
+        "group": np.repeat(list(sizes), list(sizes.values())),
+        "value": np.concatenate([rng.lognormal(1, 1, size).round(2) for size in sizes.values()]),
+    })
+
+
+def test_box_stats_match_plotly(frame):
+    fig = slim(px.box(frame, x="group", y="value"), precision=6)
+    box = fig.data[0]
+    assert list(box.x) == ["b", "a", "c"]
+    for i, group in enumerate(box.x):
+        expected = _plotly_box(frame.loc[frame["group"] == group, "value"].to_numpy())
+        for stat, value in expected.items():
+            assert box[stat][i] == pytest.approx(value, abs=1e-6), (group, stat)
+
+
+def test_box_keeps_capped_outliers(frame):
+    fig = slim(px.box(frame, x="group", y="value"), max_outliers=10)
+    box, outliers = fig.data
+    assert outliers.type == "scatter" and outliers.mode == "markers"
+    values = frame.loc[frame["group"] == "a", "value"]
+    fence = _plotly_box(values.to_numpy())
+    expected = values[(values < fence["lowerfence"]) | (values > fence["upperfence"])]
+    assert len(expected) > 10
+    kept = np.asarray(outliers.y)[np.asarray(outliers.x) == "a"]
+    assert len(kept) == 10
+    assert kept.min() == pytest.approx(expected.min()) and kept.max() == pytest.approx(expected.max())
+    assert set(np.round(kept.astype(float), 2)) <= set(expected)
+
+
+def test_histogram_counts_in_first_appearance_order():
+    x = ["Feature_3", "Feature_1", "Feature_3", "Feature_10", "Feature_1", "Feature_3"]
+    bar = slim(px.histogram(pd.DataFrame({"x": x}), x="x")).data[0]
+    assert bar.type == "bar"
+    assert list(bar.x) == ["Feature_3", "Feature_1", "Feature_10"]
+    assert list(bar.y) == [3, 2, 1]
+
+
+@pytest.mark.skipif(not payload._BINARY_ARRAYS, reason="float32 only used with binary arrays")
+def test_compact_keeps_large_values_exact():
+    small = payload._compact(np.array([0.125, 12.5, 1.75]), 3)
+    assert small.dtype == np.float32
+    totals = payload._compact(np.array([123_456_789.123, 2.5]), 3)
+    assert totals.dtype == np.float64
+    assert totals[0] == 123_456_789.123
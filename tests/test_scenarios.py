@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scenarios import CHEAPEST, CostSimulator, policy
+from src.synthetic import generate
+
+
+@pytest.fixture(scope="module")
+def df():
+    return generate(100_000, 2_000, seed=1)
+
+
+def _row_by_row(df, p):
+    totals = df.groupby(["model", "feature"])[["spent_amount", "requests_cnt"]].sum()
+    price = (totals["spent_amount"] / totals["requests_cnt"]).unstack("model")
+    cheapest = price.idxmin(axis=1)
+
+    moved = df["spent_amount"] >= p["min_spend"]
+    for column, key in [("feature", "features"), ("license", "licenses"), ("model", "models")]:
+        if p[key] is not None:
+            moved &= df[column].isin(p[key])
+    target = df["feature"].map(cheapest) if p["to"] == CHEAPEST else pd.Series(p["to"], index=df.index)
+    target = target.where(moved, df["model"])
+
+    lookup = price.stack()
+    factor = lookup.reindex(list(zip(df["feature"], target))).to_numpy() / lookup.reindex(
+        list(zip(df["feature"], df["model"]))).to_numpy()
+    spend = df["spent_amount"].to_numpy() * factor
+    return spend.sum(), pd.Series(spend).groupby(target.to_numpy()).sum()
+
+
+def test_matches_row_by_row(df):
+    simulator = CostSimulator(df)
+    values = np.sort(df["spent_amount"].unique())
+    policies = simulator.default_policies() + [
+        policy("fixed", to="Model_B", features=["Feature_1", "Feature_3"], licenses=["Premium"], min_spend=5.0),
+        # Thresholds exactly on, and right next to, data values.
+        policy("on value", min_spend=values[len(values) // 2]),
+        policy("above value", min_spend=np.nextafter(values[len(values) // 3], np.inf)),
+        policy("below value", models=["Model_C"], min_spend=np.nextafter(values[-10], -np.inf)),
+    ]
+    result, by_model = simulator.run(policies)
+
+    for i, p in enumerate(policies):
+        total, per_model = _row_by_row(df, p)
+        assert result["spend"][i] == pytest.approx(total, rel=1e-12), p["name"]
+        expected = per_model.reindex(by_model.columns, fill_value=0).to_numpy()
+        np.testing.assert_allclose(by_model.iloc[i].to_numpy(), expected, rtol=1e-12, atol=1e-6, err_msg=p["name"])
+
+
+def test_baseline_is_current_spend(df):
+    result, _ = CostSimulator(df).run([policy("Baseline", licenses=[])])
+    assert result["spend"][0] == pytest.approx(df["spent_amount"].sum(), rel=1e-12)
+    assert result["moved_requests_pct"][0] == 0